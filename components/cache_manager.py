@@ -1,84 +1,152 @@
+import sys
 import time
 import threading
 import pickle
 import zlib
 import logging
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 
+try:
+    from fastrlock.rlock import FastRLock as _CacheLock
+except ImportError:
+    _CacheLock = threading.RLock
+
+_PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def _zlib_compress(data: bytes) -> bytes:
+    return zlib.compress(data, level=6)
+
+
+# codec name -> (compress, decompress)
+_CODECS = {'zlib': (_zlib_compress, zlib.decompress)}
+_DEFAULT_CODEC = 'zlib'
+
+try:
+    import zstandard as zstd
+
+    # zstd contexts are reusable but not safe for concurrent use, so keep one per thread
+    _zstd_contexts = threading.local()
+
+    def _zstd_compress(data: bytes) -> bytes:
+        compressor = getattr(_zstd_contexts, 'compressor', None)
+        if compressor is None:
+            compressor = _zstd_contexts.compressor = zstd.ZstdCompressor(level=3)
+        return compressor.compress(data)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        decompressor = getattr(_zstd_contexts, 'decompressor', None)
+        if decompressor is None:
+            decompressor = _zstd_contexts.decompressor = zstd.ZstdDecompressor()
+        return decompressor.decompress(data)
+
+    _CODECS['zstd'] = (_zstd_compress, _zstd_decompress)
+    _DEFAULT_CODEC = 'zstd'
+except ImportError:
+    pass
+
 
 class CacheEntry:
-    def __init__(self, value: Any, ttl: Optional[int] = None, compressed: bool = False):
+    def __init__(self, value: Any, ttl: Optional[int] = None, compressed: bool = False, size_bytes: int = 0,
+                 codec: Optional[str] = None):
         self.value = value
-        self.created_at = time.time()
+        self.created_at = time.monotonic()
         self.ttl = ttl
         self.access_count = 0
-        self.last_accessed = time.time()
+        self.last_accessed = self.created_at
         self.compressed = compressed
+        self.size_bytes = size_bytes
+        self.codec = codec
 
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         if self.ttl is None:
             return False
-        return time.time() - self.created_at > self.ttl
+        if now is None:
+            now = time.monotonic()
+        return now - self.created_at > self.ttl
 
-    def access(self) -> Any:
+    def access(self, now: Optional[float] = None) -> Any:
         self.access_count += 1
-        self.last_accessed = time.time()
+        self.last_accessed = time.monotonic() if now is None else now
         
         if self.compressed:
-            return pickle.loads(zlib.decompress(self.value))
+            decompress = _CODECS[self.codec][1]
+            return pickle.loads(decompress(self.value))
         return self.value
 
 
 class CacheManager:
     def __init__(self, max_size_mb: int = 100, default_ttl: int = 3600):
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = threading.RLock()
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = _CacheLock()
         self._max_size_bytes = max_size_mb * 1024 * 1024
         self._default_ttl = default_ttl
         self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._total_size = 0
         self.logger = logging.getLogger(__name__)
         self._compression_threshold = 100 * 1024  # 100KB
+        self._small_value_limit = 4 * 1024  # 4KB
 
     def get(self, key: str) -> Optional[Any]:
         with self._lock:
             if key in self._cache:
                 entry = self._cache[key]
+                now = time.monotonic()
                 
-                if entry.is_expired():
-                    del self._cache[key]
+                if entry.is_expired(now):
+                    self._remove_entry(key)
                     self._stats['misses'] += 1
                     return None
                 
+                self._cache.move_to_end(key)
                 self._stats['hits'] += 1
-                return entry.access()
+                return entry.access(now)
             
             self._stats['misses'] += 1
             return None
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None, compress: bool = None):
         with self._lock:
+            # Size is measured once here and carried on the entry
+            if compress is None and self._is_small_value(value):
+                # Scalars and short strings never reach the compression threshold
+                compress = False
+                size_bytes = sys.getsizeof(value)
+            else:
+                size_bytes = self._cheap_size(value)
+            
             if compress is None:
-                compress = self._estimate_size(value) > self._compression_threshold
+                compress = size_bytes > self._compression_threshold
             
             if compress:
                 compressed_value = self._compress_value(value)
-                entry = CacheEntry(compressed_value, ttl or self._default_ttl, compressed=True)
+                entry = CacheEntry(compressed_value, ttl or self._default_ttl, compressed=True,
+                                   size_bytes=len(compressed_value), codec=_DEFAULT_CODEC)
             else:
-                entry = CacheEntry(value, ttl or self._default_ttl, compressed=False)
+                entry = CacheEntry(value, ttl or self._default_ttl, compressed=False,
+                                   size_bytes=size_bytes)
+            
+            if key in self._cache:
+                self._remove_entry(key)
             
             self._cache[key] = entry
+            self._total_size += entry.size_bytes
             self._evict_if_needed()
 
     def delete(self, key: str) -> bool:
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove_entry(key)
                 return True
             return False
 
     def clear(self):
         with self._lock:
             self._cache.clear()
+            self._total_size = 0
 
     def get_stats(self) -> Dict[str, Any]:
         with self._lock:
@@ -87,31 +155,49 @@ class CacheManager:
             
             return {
                 'entries': len(self._cache),
-                'size_bytes': sum(self._estimate_size(e.value) for e in self._cache.values()),
+                'size_bytes': self._total_size,
                 'hit_rate': hit_rate,
                 **self._stats
             }
 
-    def _estimate_size(self, obj: Any) -> int:
+    def _remove_entry(self, key: str) -> CacheEntry:
+        entry = self._cache.pop(key)
+        self._total_size -= entry.size_bytes
+        return entry
+
+    def _is_small_value(self, value: Any) -> bool:
+        if isinstance(value, (str, bytes)):
+            return len(value) < self._small_value_limit
+        return isinstance(value, (int, float, bool)) or value is None
+
+    def _cheap_size(self, value: Any) -> int:
         try:
-            return len(pickle.dumps(obj))
+            if isinstance(value, pd.DataFrame):
+                return int(value.memory_usage(deep=True).sum())
+            if isinstance(value, pd.Series):
+                # Series.memory_usage already returns the total as a scalar
+                return int(value.memory_usage(deep=True))
+            if isinstance(value, np.ndarray):
+                return value.nbytes
+            if isinstance(value, (bytes, bytearray, str)):
+                return len(value)
+            # One level deep: pandas and numpy report their buffers through __sizeof__
+            if isinstance(value, dict):
+                return sys.getsizeof(value) + sum(map(sys.getsizeof, value.values()))
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return sys.getsizeof(value) + sum(map(sys.getsizeof, value))
+            return sys.getsizeof(value)
         except Exception:
             return 1024
 
     def _compress_value(self, value: Any) -> bytes:
-        return zlib.compress(pickle.dumps(value), level=6)
+        compress = _CODECS[_DEFAULT_CODEC][0]
+        return compress(pickle.dumps(value, protocol=_PICKLE_PROTOCOL))
 
     def _evict_if_needed(self):
-        current_size = sum(self._estimate_size(entry.value) for entry in self._cache.values())
-        
-        if current_size > self._max_size_bytes:
-            entries = sorted(
-                self._cache.items(),
-                key=lambda x: x[1].last_accessed
-            )
-            
-            while current_size > self._max_size_bytes * 0.8 and entries:
-                key, entry = entries.pop(0)
-                current_size -= self._estimate_size(entry.value)
-                del self._cache[key]
+        if self._total_size > self._max_size_bytes:
+            # Least recently used entries sit at the front of the OrderedDict
+            while self._total_size > self._max_size_bytes * 0.8 and self._cache:
+                key, entry = self._cache.popitem(last=False)
+                self._total_size -= entry.size_bytes
                 self._stats['evictions'] += 1
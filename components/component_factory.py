@@ -1,14 +1,30 @@
 import logging
-from financial_analytics_core import (
-    DataProcessor as CoreDataProcessor,
-    FinancialRatioCalculator,
-    PenmanNissimAnalyzer,
-    IndustryBenchmarks,
-    ChartGenerator
-)
-from services.analytics_service import AnalyticsService
-from services.data_service import DataService
-from services.reporting_service import ReportingService
+import functools
+import importlib
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from financial_analytics_core import (
+        DataProcessor as CoreDataProcessor,
+        FinancialRatioCalculator,
+        PenmanNissimAnalyzer,
+        IndustryBenchmarks,
+        ChartGenerator
+    )
+    from services.analytics_service import AnalyticsService
+    from services.data_service import DataService
+    from services.reporting_service import ReportingService
+
+
+def _memoized(create_method):
+    # Argument-free factories hand back one shared instance per factory
+    @functools.wraps(create_method)
+    def wrapper(self):
+        name = create_method.__name__
+        if name not in self._instances:
+            self._instances[name] = create_method(self)
+        return self._instances[name]
+    return wrapper
 
 
 class ComponentFactory:
@@ -17,75 +33,58 @@ class ComponentFactory:
         self.state = state_manager
         self.events = event_system
         self.logger = logging.getLogger(__name__)
+        self._instances: Dict[str, Any] = {}
+        
+        # Component name -> (module, class); modules are imported on first use
+        self._registry: Dict[str, Tuple[str, str]] = {
+            'AnalyticsService': ('services.analytics_service', 'AnalyticsService'),
+            'DataService': ('services.data_service', 'DataService'),
+            'ReportingService': ('services.reporting_service', 'ReportingService'),
+            'CoreDataProcessor': ('financial_analytics_core', 'DataProcessor'),
+            'FinancialRatioCalculator': ('financial_analytics_core', 'FinancialRatioCalculator'),
+            'PenmanNissimAnalyzer': ('financial_analytics_core', 'PenmanNissimAnalyzer'),
+            'IndustryBenchmarks': ('financial_analytics_core', 'IndustryBenchmarks'),
+            'ChartGenerator': ('financial_analytics_core', 'ChartGenerator')
+        }
 
-    def create_analytics_service(self) -> AnalyticsService:
+    def _make(self, name: str, *args, **kwargs) -> Any:
         try:
-            service = AnalyticsService(self.config, self.state, self.events)
-            self.logger.info("Created AnalyticsService")
-            return service
+            module_name, class_name = self._registry[name]
+            component_cls = getattr(importlib.import_module(module_name), class_name)
+            component = component_cls(*args, **kwargs)
+            self.logger.info("Created %s", name)
+            return component
         except Exception as e:
-            self.logger.error(f"Failed to create AnalyticsService: {e}")
+            self.logger.error("Failed to create %s: %s", name, e)
             raise
 
-    def create_data_service(self) -> DataService:
-        try:
-            service = DataService(self.config, self.state, self.events)
-            self.logger.info("Created DataService")
-            return service
-        except Exception as e:
-            self.logger.error(f"Failed to create DataService: {e}")
-            raise
+    @_memoized
+    def create_analytics_service(self) -> 'AnalyticsService':
+        return self._make('AnalyticsService', self.config, self.state, self.events)
 
-    def create_reporting_service(self) -> ReportingService:
-        try:
-            service = ReportingService(self.config, self.state, self.events)
-            self.logger.info("Created ReportingService")
-            return service
-        except Exception as e:
-            self.logger.error(f"Failed to create ReportingService: {e}")
-            raise
+    @_memoized
+    def create_data_service(self) -> 'DataService':
+        return self._make('DataService', self.config, self.state, self.events)
 
-    def create_core_processor(self) -> CoreDataProcessor:
-        try:
-            processor = CoreDataProcessor()
-            self.logger.info("Created CoreDataProcessor")
-            return processor
-        except Exception as e:
-            self.logger.error(f"Failed to create CoreDataProcessor: {e}")
-            raise
+    @_memoized
+    def create_reporting_service(self) -> 'ReportingService':
+        return self._make('ReportingService', self.config, self.state, self.events)
 
-    def create_ratio_calculator(self) -> FinancialRatioCalculator:
-        try:
-            calculator = FinancialRatioCalculator()
-            self.logger.info("Created FinancialRatioCalculator")
-            return calculator
-        except Exception as e:
-            self.logger.error(f"Failed to create FinancialRatioCalculator: {e}")
-            raise
+    @_memoized
+    def create_core_processor(self) -> 'CoreDataProcessor':
+        return self._make('CoreDataProcessor')
 
-    def create_penman_nissim_analyzer(self, data, mappings) -> PenmanNissimAnalyzer:
-        try:
-            analyzer = PenmanNissimAnalyzer(data, mappings)
-            self.logger.info("Created PenmanNissimAnalyzer")
-            return analyzer
-        except Exception as e:
-            self.logger.error(f"Failed to create PenmanNissimAnalyzer: {e}")
-            raise
+    @_memoized
+    def create_ratio_calculator(self) -> 'FinancialRatioCalculator':
+        return self._make('FinancialRatioCalculator')
 
-    def create_industry_benchmarks(self) -> IndustryBenchmarks:
-        try:
-            benchmarks = IndustryBenchmarks()
-            self.logger.info("Created IndustryBenchmarks")
-            return benchmarks
-        except Exception as e:
-            self.logger.error(f"Failed to create IndustryBenchmarks: {e}")
-            raise
+    def create_penman_nissim_analyzer(self, data, mappings) -> 'PenmanNissimAnalyzer':
+        return self._make('PenmanNissimAnalyzer', data, mappings)
 
-    def create_chart_generator(self) -> ChartGenerator:
-        try:
-            generator = ChartGenerator()
-            self.logger.info("Created ChartGenerator")
-            return generator
-        except Exception as e:
-            self.logger.error(f"Failed to create ChartGenerator: {e}")
-            raise
+    @_memoized
+    def create_industry_benchmarks(self) -> 'IndustryBenchmarks':
+        return self._make('IndustryBenchmarks')
+
+    @_memoized
+    def create_chart_generator(self) -> 'ChartGenerator':
+        return self._make('ChartGenerator')
@@ -1,10 +1,12 @@
 # File: config_manager.py
 import os
+import copy
 import json
 import logging
+import functools
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, asdict
 from enum import Enum, auto
 
 
@@ -19,7 +21,7 @@ class NumberFormat(Enum):
     INTERNATIONAL = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     version: str = '5.1.0'
     name: str = 'Elite Financial Analytics Platform'
@@ -38,7 +40,7 @@ class AppConfig:
             self.allowed_file_types = ['csv', 'html', 'htm', 'xls', 'xlsx', 'zip', '7z']
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingConfig:
     max_workers: int = 4
     chunk_size: int = 10000
@@ -48,7 +50,7 @@ class ProcessingConfig:
     batch_size: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisConfig:
     confidence_threshold: float = 0.6
     outlier_std_threshold: int = 3
@@ -58,7 +60,7 @@ class AnalysisConfig:
     enable_auto_correction: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class AIConfig:
     enabled: bool = True
     model_name: str = 'all-MiniLM-L6-v2'
@@ -74,6 +76,8 @@ class AIConfig:
     kaggle_batch_size: int = 50
     kaggle_cache_results: bool = True
     kaggle_fallback_to_local: bool = True
+    kaggle_verify_ssl: bool = True  # Disable only for self-signed endpoints
+    embedding_cache_dir: str = ''  # Directory for the on-disk embedding tier; empty disables it
 
     def __post_init__(self):
         if self.confidence_levels is None:
@@ -84,7 +88,7 @@ class AIConfig:
             }
 
 
-@dataclass
+@dataclass(slots=True)
 class UIConfig:
     theme: str = 'light'
     animations: bool = True
@@ -97,7 +101,7 @@ class UIConfig:
     enable_progress_tracking: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     rate_limit_requests: int = 100
     rate_limit_window: int = 60
@@ -110,6 +114,26 @@ class SecurityConfig:
             self.allowed_html_tags = ['table', 'tr', 'td', 'th', 'tbody', 'thead', 'p', 'div', 'span', 'br']
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # mtime_ns and size only key the cache so edits to the file invalidate it
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls) -> frozenset:
+    return frozenset(f.name for f in fields(cls))
+
+
+@functools.lru_cache(maxsize=None)
+def _enum_fields(cls) -> Dict[str, type]:
+    return {
+        f.name: f.type for f in fields(cls)
+        if isinstance(f.type, type) and issubclass(f.type, Enum)
+    }
+
+
 class ConfigurationManager:
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or "config.json"
@@ -126,8 +150,10 @@ class ConfigurationManager:
     def load_config(self):
         try:
             if Path(self.config_file).exists():
-                with open(self.config_file, 'r') as f:
-                    config_data = json.load(f)
+                stat = os.stat(self.config_file)
+                config_data = copy.deepcopy(
+                    _load_config_cached(self.config_file, stat.st_mtime_ns, stat.st_size)
+                )
                 
                 # Update configurations from file
                 if 'app' in config_data:
@@ -145,36 +171,40 @@ class ConfigurationManager:
                 
                 self.logger.info("Configuration loaded successfully")
         except Exception as e:
-            self.logger.warning(f"Could not load config file: {e}")
+            self.logger.warning("Could not load config file: %s", e)
 
     def _update_config(self, config_obj, config_dict):
+        names = _field_names(type(config_obj))
+        enum_fields = _enum_fields(type(config_obj))
         for key, value in config_dict.items():
-            if hasattr(config_obj, key):
+            if key in names:
+                # Enums are saved by name
+                if key in enum_fields and isinstance(value, str):
+                    value = enum_fields[key][value]
                 setattr(config_obj, key, value)
 
     def save_config(self):
         try:
             config_data = {
-                'app': self.app.__dict__,
-                'processing': self.processing.__dict__,
-                'analysis': self.analysis.__dict__,
-                'ai': self.ai.__dict__,
-                'ui': self.ui.__dict__,
-                'security': self.security.__dict__
+                'app': asdict(self.app),
+                'processing': asdict(self.processing),
+                'analysis': asdict(self.analysis),
+                'ai': asdict(self.ai),
+                'ui': asdict(self.ui),
+                'security': asdict(self.security)
             }
             
             # Convert enums to strings
-            for section in config_data.values():
-                for key, value in section.items():
-                    if isinstance(value, Enum):
-                        section[key] = value.name
+            for name, section in config_data.items():
+                for key in _enum_fields(type(getattr(self, name))):
+                    section[key] = section[key].name
             
             with open(self.config_file, 'w') as f:
                 json.dump(config_data, f, indent=2)
             
             self.logger.info("Configuration saved successfully")
         except Exception as e:
-            self.logger.error(f"Could not save config file: {e}")
+            self.logger.error("Could not save config file: %s", e)
 
     def get(self, path: str, default: Any = None) -> Any:
         try:
@@ -201,4 +231,4 @@ class ConfigurationManager:
             if config_obj and hasattr(config_obj, key):
                 setattr(config_obj, key, value)
         except Exception as e:
-            self.logger.error(f"Error setting config {path}: {e}")
+            self.logger.error("Error setting config %s: %s", path, e)
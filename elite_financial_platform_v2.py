@@ -1,26 +1,128 @@
 import streamlit as st
 import logging
+import functools
+import importlib
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Dict, Any, Optional
 
-from config_manager import ConfigurationManager
+from config_manager import ConfigurationManager, DisplayMode
 from state_manager import StateManager
 from event_system import EventSystem
 from components.component_factory import ComponentFactory
 from components.cache_manager import CacheManager
-from services.ai_service import AIService
-from services.file_service import FileService
-from ui.overview_tab import OverviewTab
-from ui.ratios_tab import RatiosTab
-from ui.trends_tab import TrendsTab
-from ui.penman_nissim_tab import PenmanNissimTab
-from ui.industry_tab import IndustryTab
-from ui.data_explorer_tab import DataExplorerTab
-from ui.reports_tab import ReportsTab
+
+
+_logging_configured = False
+
+
+def _setup_logging():
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('elite_financial_v2.log'),
+            logging.StreamHandler()
+        ]
+    )
+    _logging_configured = True
+
+
+def configure_page():
+    # Must be the first Streamlit call of every script run, exactly once per run
+    st.set_page_config(
+        page_title="Elite Financial Analytics Platform v5.1",
+        page_icon="💹",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+
+_KAGGLE_OK_HTML = (
+    '<div class="kaggle-status"><span>🟢</span> <strong>Kaggle GPU Active</strong></div>'
+)
+_KAGGLE_ERR_HTML = (
+    '<div class="kaggle-status error"><span>🔴</span> <strong>Kaggle GPU Offline</strong></div>'
+)
+
+
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    return Path(__file__).parent.joinpath('static/app.css').read_text()
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _cached_cache_stats(cache_id: int, _cache_manager) -> Dict[str, Any]:
+    # Each session has its own CacheManager, so its id is part of the key
+    return _cache_manager.get_stats()
+
+
+# Sample datasets: (indian tech, us manufacturing, european retail) x metric x year
+_SAMPLE_ARR = np.array([
+    [[450, 520, 610, 720, 850],
+     [270, 320, 385, 465, 560],
+     [350, 380, 450, 540, 650],
+     [36.4, 44.24, 59.71, 77.42, 100.66],
+     [55, 66, 88, 110, 140]],
+    [[1200, 1150, 1250, 1350, 1450],
+     [480, 460, 510, 560, 610],
+     [950, 880, 1020, 1150, 1280],
+     [46.5, 32.25, 61.12, 82.12, 103.12],
+     [110, 90, 130, 160, 195]],
+    [[800, 750, 820, 880, 950],
+     [320, 300, 330, 360, 390],
+     [1200, 1050, 1300, 1450, 1600],
+     [43.4, 16.1, 57.4, 70.7, 83.65],
+     [95, 60, 115, 135, 160]],
+], dtype=np.float64)
+_SAMPLE_ROWS = ('Total Assets', 'Total Equity', 'Revenue', 'Net Income', 'Operating Cash Flow')
+_SAMPLE_YEARS = ('2019', '2020', '2021', '2022', '2023')
+
+
+def _sample_frame(i: int) -> pd.DataFrame:
+    return pd.DataFrame(_SAMPLE_ARR[i], index=list(_SAMPLE_ROWS), columns=list(_SAMPLE_YEARS), copy=False)
+
+
+@st.cache_data(ttl=None, max_entries=8)
+def _generate_indian_tech_data() -> pd.DataFrame:
+    return _sample_frame(0)
+
+
+@st.cache_data(ttl=None, max_entries=8)
+def _generate_us_manufacturing_data() -> pd.DataFrame:
+    return _sample_frame(1)
+
+
+@st.cache_data(ttl=None, max_entries=8)
+def _generate_european_retail_data() -> pd.DataFrame:
+    return _sample_frame(2)
+
+
+def _load_sample_frame(sample_name: str) -> pd.DataFrame:
+    if "Indian Tech" in sample_name:
+        return _generate_indian_tech_data()
+    elif "US Manufacturing" in sample_name:
+        return _generate_us_manufacturing_data()
+    return _generate_european_retail_data()
 
 
 class EliteFinancialPlatformV2:
+    # Tab key -> (label, module, class), in display order; tabs are imported and built on first render
+    _TAB_SPEC = {
+        'overview': ("📊 Overview", 'ui.overview_tab', 'OverviewTab'),
+        'ratios': ("📈 Financial Ratios", 'ui.ratios_tab', 'RatiosTab'),
+        'trends': ("📉 Trends & Forecasting", 'ui.trends_tab', 'TrendsTab'),
+        'penman_nissim': ("🎯 Penman-Nissim", 'ui.penman_nissim_tab', 'PenmanNissimTab'),
+        'industry': ("🏭 Industry Comparison", 'ui.industry_tab', 'IndustryTab'),
+        'data_explorer': ("🔍 Data Explorer", 'ui.data_explorer_tab', 'DataExplorerTab'),
+        'reports': ("📄 Reports", 'ui.reports_tab', 'ReportsTab'),
+    }
+
     def __init__(self):
         # Initialize core systems
         self.config_manager = ConfigurationManager()
@@ -29,7 +131,7 @@ class EliteFinancialPlatformV2:
         self.cache_manager = CacheManager()
         
         # Setup logging
-        self._setup_logging()
+        _setup_logging()
         self.logger = logging.getLogger(__name__)
         
         # Initialize component factory
@@ -39,27 +141,16 @@ class EliteFinancialPlatformV2:
             self.event_system
         )
         
-        # Initialize all services
+        # Initialize core services; AI/file services and tabs are built on first use
         self._initialize_all_services()
-        
-        # Initialize all UI components
-        self._initialize_all_ui_components()
+        self._tabs: Dict[str, Any] = {}
+        self._tab_fragments: Dict[str, Any] = {}
         
         # Setup event handlers
         self._setup_event_handlers()
         
         self.logger.info("EliteFinancialPlatformV2 initialized successfully")
 
-    def _setup_logging(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('elite_financial_v2.log'),
-                logging.StreamHandler()
-            ]
-        )
-
     def _initialize_all_services(self):
         try:
             # Core services
@@ -67,81 +158,64 @@ class EliteFinancialPlatformV2:
             self.data_service = self.component_factory.create_data_service()
             self.reporting_service = self.component_factory.create_reporting_service()
             
-            # Additional services
-            self.ai_service = AIService(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.file_service = FileService(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
             # Store services in state
-            self.state_manager.set('analytics_service', self.analytics_service)
-            self.state_manager.set('data_service', self.data_service)
-            self.state_manager.set('reporting_service', self.reporting_service)
-            self.state_manager.set('ai_service', self.ai_service)
-            self.state_manager.set('file_service', self.file_service)
-            self.state_manager.set('mapper', self.ai_service)  # For compatibility
+            self.state_manager.update({
+                'analytics_service': self.analytics_service,
+                'data_service': self.data_service,
+                'reporting_service': self.reporting_service,
+            })
             
             self.logger.info("All services initialized successfully")
         except Exception as e:
-            self.logger.error(f"Failed to initialize services: {e}")
+            self.logger.error("Failed to initialize services: %s", e)
             raise
 
-    def _initialize_all_ui_components(self):
-        try:
-            # Initialize all tabs
-            self.overview_tab = OverviewTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.ratios_tab = RatiosTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.trends_tab = TrendsTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.penman_nissim_tab = PenmanNissimTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.industry_tab = IndustryTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
-            
-            self.data_explorer_tab = DataExplorerTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
+    @functools.cached_property
+    def ai_service(self):
+        # Loads the embedding model, so only pay for it once AI features are used
+        from services.ai_service import AIService
+        
+        ai_service = AIService(self.config_manager, self.state_manager, self.event_system)
+        self.state_manager.update({
+            'ai_service': ai_service,
+            'mapper': ai_service,  # For compatibility
+        })
+        return ai_service
+
+    @functools.cached_property
+    def file_service(self):
+        from services.file_service import FileService
+        
+        file_service = FileService(self.config_manager, self.state_manager, self.event_system)
+        self.state_manager.set('file_service', file_service)
+        return file_service
+
+    def _get_tab(self, attr: str):
+        tab = self._tabs.get(attr)
+        if tab is None:
+            _, module_name, class_name = self._TAB_SPEC[attr]
+            if attr == 'ratios':
+                # Manual mapping looks up the AI service in state as 'mapper'
+                self.ai_service
+            tab_class = getattr(importlib.import_module(module_name), class_name)
+            tab = self._tabs[attr] = tab_class(self.config_manager, self.state_manager, self.event_system)
+        return tab
+
+    def _get_tab_fragment(self, attr: str):
+        render = self._tab_fragments.get(attr)
+        if render is None:
+            tab = self._get_tab(attr)
             
-            self.reports_tab = ReportsTab(
-                self.config_manager,
-                self.state_manager,
-                self.event_system
-            )
+            # Wrapped once per tab, so a widget inside it reruns only that tab. Streamlit keeps
+            # the first closure for fragment reruns, so data is read from state, not passed in
+            @st.fragment
+            def render():
+                data = self.state_manager.get('analysis_data')
+                if data is not None:
+                    tab.render(data)
             
-            self.logger.info("All UI components initialized successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize UI components: {e}")
-            raise
+            self._tab_fragments[attr] = render
+        return render
 
     def _setup_event_handlers(self):
         # Subscribe to important events
@@ -152,30 +226,25 @@ class EliteFinancialPlatformV2:
         self.event_system.subscribe("error", self._on_error)
 
     def _on_data_processed(self, event):
-        self.logger.info(f"Data processed: {event.data}")
+        self.logger.info("Data processed: %s", event.data)
 
     def _on_analysis_completed(self, event):
-        self.logger.info(f"Analysis completed with {len(event.data.get('insights', []))} insights")
+        if self.logger.isEnabledFor(logging.INFO):
+            insights = event.data.get('insights', ())
+            count = len(insights) if hasattr(insights, '__len__') else 'unknown'
+            self.logger.info("Analysis completed with %s insights", count)
 
     def _on_mapping_completed(self, event):
-        self.logger.info(f"Mapping completed: {event.data.get('method', 'unknown')} method")
+        self.logger.info("Mapping completed: %s method", event.data.get('method', 'unknown'))
 
     def _on_kaggle_connected(self, event):
-        self.logger.info(f"Kaggle API connected: {event.data}")
+        self.logger.info("Kaggle API connected: %s", event.data)
 
     def _on_error(self, event):
-        self.logger.error(f"Error occurred: {event.data}")
+        self.logger.error("Error occurred: %s", event.data)
 
     def run(self):
         try:
-            # Set page config
-            st.set_page_config(
-                page_title="Elite Financial Analytics Platform v5.1",
-                page_icon="💹",
-                layout="wide",
-                initial_sidebar_state="expanded"
-            )
-            
             # Apply custom CSS
             self._apply_custom_css()
             
@@ -189,50 +258,14 @@ class EliteFinancialPlatformV2:
             self._render_main_content()
             
         except Exception as e:
-            self.logger.error(f"Application error: {e}")
+            self.logger.error("Application error: %s", e)
             st.error("An unexpected error occurred. Please refresh the page.")
             
             if self.config_manager.app.debug:
                 st.exception(e)
 
     def _apply_custom_css(self):
-        st.markdown("""
-        <style>
-        .main-header {
-            font-size: 3rem;
-            font-weight: 800;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            text-align: center;
-            padding: 2rem 0;
-            margin-bottom: 2rem;
-        }
-        
-        .stMetric {
-            background-color: #ffffff;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        
-        .kaggle-status {
-            position: fixed;
-            top: 60px;
-            right: 20px;
-            background: white;
-            border: 2px solid #4CAF50;
-            border-radius: 10px;
-            padding: 10px 20px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            z-index: 1000;
-        }
-        
-        .kaggle-status.error {
-            border-color: #f44336;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
     def _render_header(self):
         st.markdown(
@@ -244,7 +277,11 @@ class EliteFinancialPlatformV2:
         if self.config_manager.ai.kaggle_api_url and self.state_manager.get('kaggle_api_enabled'):
             self._render_kaggle_status()
         
-        # System status
+        # System status refreshes on its own timer rather than on every interaction
+        self._render_system_metrics()
+
+    @st.fragment(run_every=5)
+    def _render_system_metrics(self):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -255,32 +292,18 @@ class EliteFinancialPlatformV2:
             st.metric("Mode", mode, help="Current operating mode")
         
         with col3:
-            cache_stats = self.cache_manager.get_stats()
-            hit_rate = cache_stats.get('hit_rate', 0)
+            hit_rate = _cached_cache_stats(id(self.cache_manager), self.cache_manager).get('hit_rate', 0)
             st.metric("Cache Hit Rate", f"{hit_rate:.1f}%", help="Cache performance")
         
         with col4:
             st.metric("Version", self.config_manager.app.version, help="Platform version")
 
     def _render_kaggle_status(self):
-        api_status = self.ai_service.get_api_status()
-        
-        if api_status['kaggle_available']:
-            status_html = """
-            <div class="kaggle-status">
-                <span>🟢</span>
-                <strong>Kaggle GPU Active</strong>
-            </div>
-            """
+        # get_api_status only reads the flag kept by the AI service's health checks
+        if self.ai_service.get_api_status()['kaggle_available']:
+            st.markdown(_KAGGLE_OK_HTML, unsafe_allow_html=True)
         else:
-            status_html = """
-            <div class="kaggle-status error">
-                <span>🔴</span>
-                <strong>Kaggle GPU Offline</strong>
-            </div>
-            """
-        
-        st.markdown(status_html, unsafe_allow_html=True)
+            st.markdown(_KAGGLE_ERR_HTML, unsafe_allow_html=True)
 
     def _render_sidebar(self):
         st.sidebar.title("⚙️ Configuration")
@@ -321,8 +344,10 @@ class EliteFinancialPlatformV2:
                             
                             if self.ai_service._kaggle_available:
                                 st.success("✅ Successfully connected!")
-                                self.state_manager.set('kaggle_api_url', api_url)
-                                self.state_manager.set('kaggle_api_enabled', True)
+                                self.state_manager.update({
+                                    'kaggle_api_url': api_url,
+                                    'kaggle_api_enabled': True,
+                                })
                             else:
                                 st.error("❌ Connection failed")
                     else:
@@ -382,7 +407,6 @@ class EliteFinancialPlatformV2:
         )
         
         if selected_mode != current_mode:
-            from config_manager import DisplayMode
             self.config_manager.app.display_mode = DisplayMode[selected_mode]
         
         # Number format
@@ -419,88 +443,45 @@ class EliteFinancialPlatformV2:
                     processed_df, result = self.data_service.process_data(merged_df)
                     
                     # Store in state
-                    self.state_manager.set('analysis_data', processed_df)
-                    self.state_manager.set('data_source', 'uploaded_files')
+                    self.state_manager.update({
+                        'analysis_data': processed_df,
+                        'data_source': 'uploaded_files',
+                    })
                     
                     st.sidebar.success(f"✅ Processed {len(uploaded_files)} file(s)")
                 else:
                     st.sidebar.error("Failed to process files")
                     
         except Exception as e:
-            self.logger.error(f"File processing failed: {e}")
+            self.logger.error("File processing failed: %s", e)
             st.sidebar.error("File processing failed")
 
     def _load_sample_data(self, sample_name):
         try:
             with st.spinner(f"Loading {sample_name}..."):
-                # Generate sample data based on selection
-                if "Indian Tech" in sample_name:
-                    df = self._generate_indian_tech_data()
-                elif "US Manufacturing" in sample_name:
-                    df = self._generate_us_manufacturing_data()
-                else:
-                    df = self._generate_european_retail_data()
-                
-                # Process data
-                processed_df, result = self.data_service.process_data(df, "sample_data")
+                # Sample frames are cached; processing runs every time so its events still fire
+                sample_df = _load_sample_frame(sample_name)
+                processed_df, result = self.data_service.process_data(sample_df, "sample_data")
                 
                 # Store in state
-                self.state_manager.set('analysis_data', processed_df)
-                self.state_manager.set('company_name', sample_name)
-                self.state_manager.set('data_source', 'sample_data')
+                self.state_manager.update({
+                    'analysis_data': processed_df,
+                    'company_name': sample_name,
+                    'data_source': 'sample_data',
+                })
                 
                 st.sidebar.success(f"✅ Loaded {sample_name}")
                 
         except Exception as e:
-            self.logger.error(f"Sample data loading failed: {e}")
+            self.logger.error("Sample data loading failed: %s", e)
             st.sidebar.error("Failed to load sample data")
 
-    def _generate_indian_tech_data(self):
-        # Sample data generation
-        years = ['2019', '2020', '2021', '2022', '2023']
-        
-        data = {
-            'Total Assets': [450, 520, 610, 720, 850],
-            'Total Equity': [270, 320, 385, 465, 560],
-            'Revenue': [350, 380, 450, 540, 650],
-            'Net Income': [36.4, 44.24, 59.71, 77.42, 100.66],
-            'Operating Cash Flow': [55, 66, 88, 110, 140]
-        }
-        
-        return pd.DataFrame(data, index=list(data.keys()), columns=years)
-
-    def _generate_us_manufacturing_data(self):
-        years = ['2019', '2020', '2021', '2022', '2023']
-        
-        data = {
-            'Total Assets': [1200, 1150, 1250, 1350, 1450],
-            'Total Equity': [480, 460, 510, 560, 610],
-            'Revenue': [950, 880, 1020, 1150, 1280],
-            'Net Income': [46.5, 32.25, 61.12, 82.12, 103.12],
-            'Operating Cash Flow': [110, 90, 130, 160, 195]
-        }
-        
-        return pd.DataFrame(data, index=list(data.keys()), columns=years)
-
-    def _generate_european_retail_data(self):
-        years = ['2019', '2020', '2021', '2022', '2023']
-        
-        data = {
-            'Total Assets': [800, 750, 820, 880, 950],
-            'Total Equity': [320, 300, 330, 360, 390],
-            'Revenue': [1200, 1050, 1300, 1450, 1600],
-            'Net Income': [43.4, 16.1, 57.4, 70.7, 83.65],
-            'Operating Cash Flow': [95, 60, 115, 135, 160]
-        }
-        
-        return pd.DataFrame(data, index=list(data.keys()), columns=years)
-
     def _render_main_content(self):
         # Check if data is available
         data = self.state_manager.get('analysis_data')
         
         if data is not None:
-            self._render_analysis_interface(data)
+            self._render_analysis_interface()
         else:
             self._render_welcome_screen()
 
@@ -552,41 +533,26 @@ class EliteFinancialPlatformV2:
             - 🔮 ML-powered forecasting
             """)
 
-    def _render_analysis_interface(self, data: pd.DataFrame):
-        # Create tabs
-        tabs = st.tabs([
-            "📊 Overview",
-            "📈 Financial Ratios",
-            "📉 Trends & Forecasting",
-            "🎯 Penman-Nissim",
-            "🏭 Industry Comparison",
-            "🔍 Data Explorer",
-            "📄 Reports"
-        ])
-        
-        with tabs[0]:
-            self.overview_tab.render(data)
-        
-        with tabs[1]:
-            self.ratios_tab.render(data)
-        
-        with tabs[2]:
-            self.trends_tab.render(data)
-        
-        with tabs[3]:
-            self.penman_nissim_tab.render(data)
+    def _render_analysis_interface(self):
+        tabs = st.tabs([label for label, _, _ in self._TAB_SPEC.values()])
         
-        with tabs[4]:
-            self.industry_tab.render(data)
-        
-        with tabs[5]:
-            self.data_explorer_tab.render(data)
-        
-        with tabs[6]:
-            self.reports_tab.render(data)
+        for tab_ctx, attr in zip(tabs, self._TAB_SPEC):
+            with tab_ctx:
+                self._get_tab_fragment(attr)()
+
+
+def get_platform() -> EliteFinancialPlatformV2:
+    # One platform per browser session, reused across its reruns. Its StateManager and
+    # config hold that user's data and settings, so it must never be shared process-wide;
+    # the heavy embedding model is shared inside AIService instead
+    platform = st.session_state.get('_platform')
+    if platform is None:
+        platform = st.session_state['_platform'] = EliteFinancialPlatformV2()
+    return platform
 
 
 # Entry point
 if __name__ == "__main__":
-    platform = EliteFinancialPlatformV2()
+    configure_page()
+    platform = get_platform()
     platform.run()
@@ -1,9 +1,16 @@
+import bisect
+import itertools
 import threading
 import logging
-from typing import Any, Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from collections import defaultdict
+from collections import Counter, deque
+
+
+# Event ids only correlate history within this process, so a counter is enough
+_EVENT_SEQ = itertools.count(1)
 
 
 @dataclass
@@ -12,43 +19,43 @@ class Event:
     data: Any
     source: str
     timestamp: datetime
-    id: str = None
+    id: int = None
 
     def __post_init__(self):
         if self.id is None:
-            import uuid
-            self.id = str(uuid.uuid4())
+            self.id = next(_EVENT_SEQ)
 
 
 class EventSystem:
     def __init__(self):
-        self._handlers: Dict[str, List[tuple]] = defaultdict(list)  # List of (handler, priority) tuples
-        self._event_history: List[Event] = []
+        # Sorted (-priority, seq, handler, sync) entries per event type. Each value is an
+        # immutable tuple replaced wholesale under the lock, so publish can read it without one
+        self._handlers: Dict[str, Tuple[tuple, ...]] = {}
+        self._seq = itertools.count()
         self._max_history = 1000
-        self._lock = threading.RLock()
+        self._event_history: deque = deque(maxlen=self._max_history)
+        self._event_counts: Counter = Counter()  # Per-type counts of the events in history
+        self._lock = threading.Lock()  # Never re-entered: handlers run outside it
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='evt')
         self.logger = logging.getLogger(__name__)
 
-    def subscribe(self, event_type: str, handler: Callable[[Event], None], priority: int = 0):
+    def subscribe(self, event_type: str, handler: Callable[[Event], None], priority: int = 0,
+                  sync: bool = False):
+        # sync handlers run inline on the publisher's thread (e.g. ones that touch
+        # st.session_state); the rest are dispatched to the worker pool
         with self._lock:
-            # Insert handler based on priority (higher priority first)
-            handlers = self._handlers[event_type]
-            inserted = False
-            
-            for i, (existing_handler, existing_priority) in enumerate(handlers):
-                if priority > existing_priority:
-                    handlers.insert(i, (handler, priority))
-                    inserted = True
-                    break
-            
-            if not inserted:
-                handlers.append((handler, priority))
+            # Higher priority first; the sequence number keeps equal priorities in
+            # subscription order and stops handlers themselves from being compared
+            handlers = list(self._handlers.get(event_type, ()))
+            bisect.insort(handlers, (-priority, next(self._seq), handler, sync))
+            self._handlers[event_type] = tuple(handlers)
         
         self.logger.debug(f"Subscribed handler to event type: {event_type}")
 
     def unsubscribe(self, event_type: str, handler: Callable):
         with self._lock:
-            handlers = self._handlers[event_type]
-            self._handlers[event_type] = [(h, p) for h, p in handlers if h != handler]
+            handlers = self._handlers.get(event_type, ())
+            self._handlers[event_type] = tuple(entry for entry in handlers if entry[2] != handler)
 
     def publish(self, event_type: str, data: Any, source: str = "unknown") -> Event:
         event = Event(
@@ -60,42 +67,62 @@ class EventSystem:
         
         # Add to history
         with self._lock:
+            if len(self._event_history) == self._max_history:
+                # The oldest event is about to fall out of the window
+                evicted_type = self._event_history[0].type
+                self._event_counts[evicted_type] -= 1
+                if not self._event_counts[evicted_type]:
+                    del self._event_counts[evicted_type]
             self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history = self._event_history[-self._max_history:]
+            self._event_counts[event_type] += 1
         
-        # Notify handlers
-        handlers = self._handlers.get(event_type, [])
-        for handler, priority in handlers:
-            try:
-                handler(event)
-            except Exception as e:
-                self.logger.error(f"Error in event handler for {event_type}: {e}")
+        # Notify handlers, in priority order of invocation/submission
+        handlers = self._handlers.get(event_type, ())
+        for _, _, handler, sync in handlers:
+            if sync:
+                self._safe_call(handler, event)
+            else:
+                self._executor.submit(self._safe_call, handler, event)
         
         self.logger.debug(f"Published event: {event_type}")
         return event
 
+    def _safe_call(self, handler: Callable[[Event], None], event: Event):
+        try:
+            handler(event)
+        except Exception as e:
+            self.logger.error(f"Error in event handler for {event.type}: {e}")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
     def get_event_history(self, event_type: str = None, limit: int = 100) -> List[Event]:
         with self._lock:
+            if limit <= 0:
+                # Same as slicing with [-limit:]: 0 returns everything, -k drops the oldest k
+                events = [e for e in self._event_history if not event_type or e.type == event_type]
+                return events[-limit:]
             if event_type:
-                filtered_events = [e for e in self._event_history if e.type == event_type]
-                return filtered_events[-limit:]
+                # Walk newest-first and stop once the limit is reached
+                filtered_events = list(itertools.islice(
+                    (e for e in reversed(self._event_history) if e.type == event_type), limit
+                ))
+                filtered_events.reverse()
+                return filtered_events
             else:
-                return self._event_history[-limit:]
+                start = max(0, len(self._event_history) - limit)
+                return list(itertools.islice(self._event_history, start, None))
 
     def clear_history(self):
         with self._lock:
             self._event_history.clear()
+            self._event_counts.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         with self._lock:
-            event_counts = defaultdict(int)
-            for event in self._event_history:
-                event_counts[event.type] += 1
-            
             return {
                 'total_events': len(self._event_history),
                 'event_types': len(self._handlers),
-                'event_counts': dict(event_counts),
+                'event_counts': dict(self._event_counts),
                 'handlers_count': {k: len(v) for k, v in self._handlers.items()}
             }
@@ -7,13 +7,15 @@ current_dir = Path(__file__).parent
 if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
-from elite_financial_platform_v2 import EliteFinancialPlatformV2
+from elite_financial_platform_v2 import configure_page, get_platform
 
 
 def main():
+    configure_page()
+    
     try:
-        # Create and run the application
-        app = EliteFinancialPlatformV2()
+        # Get this session's application instance and run it
+        app = get_platform()
         app.run()
         
     except Exception as e:
@@ -27,7 +29,7 @@ def main():
         
         with col1:
             if st.button("🔄 Refresh Page"):
-                st.experimental_rerun()
+                st.rerun()
         
         with col2:
             if st.button("🗑️ Clear Cache"):
@@ -36,9 +38,8 @@ def main():
         
         with col3:
             if st.button("🏠 Reset Application"):
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
-                st.experimental_rerun()
+                st.session_state.clear()
+                st.rerun()
 
 
 if __name__ == "__main__":
@@ -2,13 +2,59 @@ import logging
 import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
 import threading
 import time
 import queue
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 import hashlib
+import itertools
 from collections import OrderedDict
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+# Fixed mapping targets; their normalized embeddings are cached per model in AIService
+_STANDARD_METRICS = (
+    'Total Assets', 'Current Assets', 'Non-current Assets',
+    'Cash and Cash Equivalents', 'Inventory', 'Trade Receivables',
+    'Property Plant and Equipment', 'Total Liabilities',
+    'Current Liabilities', 'Non-current Liabilities',
+    'Total Equity', 'Share Capital', 'Retained Earnings',
+    'Revenue', 'Cost of Goods Sold', 'Gross Profit',
+    'Operating Expenses', 'Operating Income', 'Net Income',
+    'Earnings Per Share', 'Operating Cash Flow',
+    'Investing Cash Flow', 'Financing Cash Flow',
+    'EBIT', 'EBITDA', 'Interest Expense', 'Tax Expense'
+)
+
+# Sentence-transformer models by name, shared by every AIService in the process. The
+# model is read-only at inference time; services stay per session with their own state
+_LOCAL_MODELS: Dict[str, Any] = {}
+_LOCAL_MODELS_LOCK = threading.Lock()
+
+# On-disk embedding stores by (directory, model id). Every AIService in the process must go
+# through the same store, or each one's private row count overwrites the others' rows
+_DISK_STORES: Dict[Tuple[str, str], Optional['EmbeddingDiskStore']] = {}
+_DISK_STORES_LOCK = threading.Lock()
+
+# Kaggle request pipelines by (base url, api key, verify ssl), shared process-wide
+_KAGGLE_PIPELINES: Dict[Tuple[str, str, bool], '_KagglePipeline'] = {}
+_KAGGLE_PIPELINES_LOCK = threading.Lock()
+
+
+def _best_match(sources: np.ndarray, targets_t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    similarities = sources @ targets_t
+    best_idx = similarities.argmax(axis=1)
+    return best_idx, similarities[np.arange(len(sources)), best_idx]
 
 
 @dataclass
@@ -28,6 +74,10 @@ class AIRequest:
 
 
 class AIService:
+    # Request priorities: lower runs first
+    PRIORITY_MAPPING = 1
+    PRIORITY_BACKGROUND = 9
+
     def __init__(self, config_manager, state_manager, event_system):
         self.config = config_manager
         self.state = state_manager
@@ -35,14 +85,25 @@ class AIService:
         self.logger = logging.getLogger(__name__)
         
         self.model = None
+        # (model id, text digest) -> (int8 embedding, scale), in LRU order
         self.embeddings_cache = OrderedDict()
         self._max_cache_size = 1000
+        self._cache_lock = threading.Lock()
         self._kaggle_available = False
         self._kaggle_info = {}
         self._api_client = None
         self._last_health_check = None
         self._health_check_lock = threading.Lock()
         
+        # Kaggle requests go through a process-wide _KagglePipeline; ids only need to be unique here
+        self._request_seq = itertools.count()
+        
+        # Normalized target embeddings reused across mapping calls
+        self._target_matrix_t: Optional[np.ndarray] = None  # [D, T], C-contiguous
+        self._target_index = None  # faiss inner-product index over the same targets, when available
+        self._valid_targets: List[str] = []
+        self._target_matrix_key = None
+        
         self._initialize()
 
     def _initialize(self):
@@ -103,10 +164,21 @@ class AIService:
                 self.logger.warning("Sentence transformers not available")
                 return
             
+            import torch
             from sentence_transformers import SentenceTransformer
             model_name = self.config.ai.model_name
-            self.model = SentenceTransformer(model_name)
-            self.model.eval()
+            with _LOCAL_MODELS_LOCK:
+                model = _LOCAL_MODELS.get(model_name)
+                if model is None:
+                    model = SentenceTransformer(model_name)
+                    model.eval()
+                    
+                    # Half precision on GPU: half the memory traffic, same retrieval ranking
+                    if torch.cuda.is_available() and model.device.type == 'cuda':
+                        model = model.half()
+                    _LOCAL_MODELS[model_name] = model
+            
+            self.model = model
             
             self.logger.info(f"Loaded local model: {model_name}")
             
@@ -134,30 +206,24 @@ class AIService:
                 'method': mapping_result.get('method', 'unknown')
             }
             
-            for source in source_metrics:
-                if source in mapping_result['mappings']:
-                    confidence = mapping_result['confidence_scores'].get(source, 0)
-                    target = mapping_result['mappings'][source]
-                    
-                    if confidence >= confidence_thresholds['high']:
-                        results['high_confidence'][source] = {
-                            'target': target,
-                            'confidence': confidence
-                        }
-                    elif confidence >= confidence_thresholds['medium']:
-                        results['medium_confidence'][source] = {
-                            'target': target,
-                            'confidence': confidence
-                        }
-                    elif confidence >= confidence_thresholds['low']:
-                        results['low_confidence'][source] = {
-                            'target': target,
-                            'confidence': confidence
-                        }
-                    else:
-                        results['requires_manual'].append(source)
-                else:
-                    results['requires_manual'].append(source)
+            # Bucket every source at once: 0 = manual, 1 = low, 2 = medium, 3 = high
+            mappings = mapping_result['mappings']
+            scores = np.array([mapping_result['confidence_scores'].get(source, 0) for source in source_metrics], dtype=np.float64)
+            buckets = np.digitize(scores, [
+                confidence_thresholds['low'],
+                confidence_thresholds['medium'],
+                confidence_thresholds['high']
+            ])
+            mapped = np.array([source in mappings for source in source_metrics], dtype=bool)
+            buckets[~mapped] = 0
+            
+            score_list = scores.tolist()
+            for bucket, key in ((3, 'high_confidence'), (2, 'medium_confidence'), (1, 'low_confidence')):
+                results[key] = {
+                    source_metrics[i]: {'target': mappings[source_metrics[i]], 'confidence': score_list[i]}
+                    for i in np.flatnonzero(buckets == bucket)
+                }
+            results['requires_manual'] = [source_metrics[i] for i in np.flatnonzero(buckets == 0)]
             
             self.events.publish("mapping_completed", results, "AIService")
             return results
@@ -171,12 +237,12 @@ class AIService:
         mappings = {}
         confidence_scores = {}
         
-        # Get embeddings for all metrics
+        # Get embeddings for all metrics, one batch per side
         source_embeddings = []
         valid_sources = []
         
-        for metric in source_metrics:
-            embedding = self._get_embedding(str(metric).lower())
+        batch = self._get_embeddings_batch([str(metric).lower() for metric in source_metrics])
+        for metric, embedding in zip(source_metrics, batch):
             if embedding is not None:
                 source_embeddings.append(embedding)
                 valid_sources.append(metric)
@@ -188,34 +254,25 @@ class AIService:
                 'method': 'none'
             }
         
-        # Get target embeddings
-        target_embeddings = []
-        valid_targets = []
-        
-        for target in target_metrics:
-            embedding = self._get_embedding(target.lower())
-            if embedding is not None:
-                target_embeddings.append(embedding)
-                valid_targets.append(target)
-        
         # Calculate similarities
         try:
-            from sklearn.metrics.pairwise import cosine_similarity
+            target_matrix_t, valid_targets = self._get_target_matrix(target_metrics)
+            if not valid_targets:
+                raise ValueError("No target embeddings available")
             
-            source_matrix = np.vstack(source_embeddings)
-            target_matrix = np.vstack(target_embeddings)
-            
-            similarities = cosine_similarity(source_matrix, target_matrix)
+            # Rows are unit length, so dot products are cosine similarities
+            source_matrix = self._normalize_rows(np.vstack(source_embeddings))
+            if self._target_index is not None:
+                scores, indices = self._target_index.search(source_matrix, 1)
+                best_idx, best_scores = indices[:, 0], scores[:, 0]
+            else:
+                best_idx, best_scores = _best_match(source_matrix, target_matrix_t)
             
             # Create mappings
-            for idx, source in enumerate(valid_sources):
-                sim_scores = similarities[idx]
-                best_idx = np.argmax(sim_scores)
-                best_score = sim_scores[best_idx]
-                
-                if best_score >= self.config.ai.similarity_threshold:
-                    mappings[source] = valid_targets[best_idx]
-                    confidence_scores[source] = float(best_score)
+            for i in np.flatnonzero(best_scores >= self.config.ai.similarity_threshold):
+                source = valid_sources[i]
+                mappings[source] = valid_targets[best_idx[i]]
+                confidence_scores[source] = float(best_scores[i])
             
         except Exception as e:
             self.logger.error(f"Similarity calculation failed: {e}")
@@ -226,40 +283,146 @@ class AIService:
             'method': 'ai' if self._kaggle_available else 'local_ai'
         }
 
+    def _get_target_matrix(self, target_metrics: List[str]) -> Tuple[np.ndarray, List[str]]:
+        # Targets are fixed, so their normalized matrix is rebuilt only when the list or backend changes
+        key = (tuple(target_metrics), self._active_model_id())
+        if self._target_matrix_key != key:
+            target_embeddings = []
+            valid_targets = []
+            
+            batch = self._get_embeddings_batch([target.lower() for target in target_metrics])
+            for target, embedding in zip(target_metrics, batch):
+                if embedding is not None:
+                    target_embeddings.append(embedding)
+                    valid_targets.append(target)
+            
+            if not valid_targets:
+                return np.empty((0, 0)), []
+            
+            # Stored transposed once so every call multiplies against [D, T] directly
+            target_matrix = self._normalize_rows(np.vstack(target_embeddings))
+            self._target_matrix_t = np.ascontiguousarray(target_matrix.T)
+            self._target_index = self._build_target_index(target_matrix)
+            self._valid_targets = valid_targets
+            self._target_matrix_key = key
+        
+        return self._target_matrix_t, self._valid_targets
+
+    def _build_target_index(self, target_matrix: np.ndarray):
+        if faiss is None:
+            return None
+        try:
+            # Exact search; on unit rows inner product is cosine similarity
+            index = faiss.IndexFlatIP(target_matrix.shape[1])
+            index.add(np.ascontiguousarray(target_matrix))
+            return index
+        except Exception as e:
+            self.logger.warning(f"faiss index unavailable, using matmul: {e}")
+            return None
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
     def _get_embedding(self, text: str) -> Optional[np.ndarray]:
-        # Check cache first
-        if text in self.embeddings_cache:
-            self.embeddings_cache.move_to_end(text)
-            return self.embeddings_cache[text]
+        return self._get_embeddings_batch([text])[0]
+
+    def _get_embeddings_batch(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
         
-        embedding = None
+        # Serve cache hits, and collect each distinct miss with the positions that need it
+        model_id = self._active_model_id()
+        with self._cache_lock:
+            for i, text in enumerate(texts):
+                key = self._cache_key(model_id, text)
+                if key in self.embeddings_cache:
+                    self.embeddings_cache.move_to_end(key)
+                    results[i] = self._dequantize(*self.embeddings_cache[key])
+                    continue
+                
+                # RAM miss: try the persistent tier before going to a model
+                cached = self._read_from_disk(key)
+                if cached is not None:
+                    self._add_to_cache(key, cached)
+                    results[i] = self._dequantize(*cached)
+                else:
+                    missing.setdefault(text, []).append(i)
+        
+        if not missing:
+            return results
         
-        # Try Kaggle first if available
+        pending = list(missing)
+        embeddings = None
+        
+        # Try Kaggle first if available: one request for the whole batch
         if self._kaggle_available:
-            embedding = self._get_embedding_kaggle(text)
+            embeddings = self._get_embeddings_kaggle(pending)
         
         # Fallback to local model
-        if embedding is None and self.model is not None:
-            embedding = self._get_embedding_local(text)
+        if embeddings is None and self.model is not None:
+            embeddings = self._get_embeddings_local(pending)
+            model_id = self._local_model_id()
+        
+        if embeddings is None:
+            return results
         
-        # Cache the result
-        if embedding is not None:
-            self._add_to_cache(text, embedding)
+        # Cache the results under the model that produced them and fill them in order.
+        # Fresh results go through the same quantization so a mapping never depends on cache state
+        with self._cache_lock:
+            for text, embedding in zip(pending, embeddings):
+                quantized = self._quantize(embedding)
+                key = self._cache_key(model_id, text)
+                self._add_to_cache(key, quantized)
+                self._write_to_disk(key, quantized)
+                embedding = self._dequantize(*quantized)
+                for i in missing[text]:
+                    results[i] = embedding
         
-        return embedding
+        return results
+
+    def _get_embeddings_kaggle(self, texts: List[str]) -> Optional[List[np.ndarray]]:
+        batch_size = max(1, self.config.ai.kaggle_batch_size)
+        if len(texts) <= batch_size:
+            return self._request_embeddings_kaggle(texts)
+        
+        # The API caps batch size, so larger inputs go out as concurrent chunked requests
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks)), thread_name_prefix='kaggle') as executor:
+            chunk_results = list(executor.map(self._request_embeddings_kaggle, chunks))
+        
+        if any(result is None for result in chunk_results):
+            return None
+        return [embedding for result in chunk_results for embedding in result]
 
-    def _get_embedding_kaggle(self, text: str) -> Optional[np.ndarray]:
+    def _request_embeddings_kaggle(self, texts: List[str]) -> Optional[List[np.ndarray]]:
         try:
-            response = self._api_client.make_request(
-                'POST', '/embed',
-                {'texts': [text]},
-                timeout=10
+            # Go through the pipeline so concurrent callers share POSTs; call directly if it is full
+            future: Future = Future()
+            request = AIRequest(
+                id=str(next(self._request_seq)),
+                endpoint='/embed',
+                method='POST',
+                data={'texts': texts},
+                priority=self.PRIORITY_MAPPING,
+                callback=future.set_result
             )
+            if self.submit_request(request):
+                try:
+                    response = future.result(timeout=self.config.ai.kaggle_api_timeout)
+                except FutureTimeout:
+                    self.logger.warning("Kaggle embedding request timed out in queue")
+                    return None
+            else:
+                response = self._api_client.make_request('POST', '/embed', {'texts': texts}, timeout=10)
             
             if response and 'embeddings' in response:
                 embeddings = response['embeddings']
-                if embeddings and len(embeddings) > 0:
-                    return np.array(embeddings[0])
+                if embeddings and len(embeddings) == len(texts):
+                    return [np.asarray(embedding) for embedding in embeddings]
                     
             return None
             
@@ -267,35 +430,105 @@ class AIService:
             self.logger.error(f"Kaggle embedding error: {e}")
             return None
 
-    def _get_embedding_local(self, text: str) -> Optional[np.ndarray]:
+    def submit_request(self, request: AIRequest) -> bool:
+        if self._api_client is None:
+            return False
+        return self._kaggle_pipeline().submit(request)
+
+    def _kaggle_pipeline(self) -> '_KagglePipeline':
+        # Keyed on everything that decides where a POST goes and how it authenticates, so
+        # requests are only ever coalesced with others bound for the same endpoint and key
+        key = (self._api_client.base_url, self.config.ai.kaggle_api_key, self.config.ai.kaggle_verify_ssl)
+        with _KAGGLE_PIPELINES_LOCK:
+            pipeline = _KAGGLE_PIPELINES.get(key)
+            if pipeline is None:
+                pipeline = _KAGGLE_PIPELINES[key] = _KagglePipeline(self._api_client, self.config.ai.kaggle_batch_size)
+            return pipeline
+
+    def _get_embeddings_local(self, texts: List[str]) -> Optional[np.ndarray]:
         if self.model is None:
             return None
             
         try:
-            return self.model.encode(text, convert_to_numpy=True, show_progress_bar=False)
+            import torch
+            
+            # inference_mode skips the autograd bookkeeping that eval() alone still pays; the
+            # model is already half precision on CUDA
+            with torch.inference_mode():
+                return self.model.encode(texts, batch_size=64, convert_to_numpy=True, show_progress_bar=False)
         except Exception as e:
             self.logger.error(f"Local embedding error: {e}")
             return None
 
-    def _add_to_cache(self, text: str, embedding: np.ndarray):
+    def _active_model_id(self) -> str:
+        if self._kaggle_available:
+            return f"kaggle:{self.config.ai.kaggle_api_url}"
+        return self._local_model_id()
+
+    def _local_model_id(self) -> str:
+        return f"local:{self.config.ai.model_name}"
+
+    @staticmethod
+    def _cache_key(model_id: str, text: str) -> Tuple[str, bytes]:
+        # Keyed per model so switching models can never serve another model's vectors
+        return model_id, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+        # Symmetric per-vector int8: a quarter of the float32 footprint, same cosine ranking
+        embedding = np.asarray(embedding, dtype=np.float32)
+        peak = float(np.max(np.abs(embedding))) if embedding.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        return np.round(embedding / scale).astype(np.int8), scale
+
+    @staticmethod
+    def _dequantize(quantized: np.ndarray, scale: float) -> np.ndarray:
+        return quantized.astype(np.float32) * np.float32(scale)
+
+    def _disk_store(self, model_id: str) -> Optional['EmbeddingDiskStore']:
+        directory = self.config.ai.embedding_cache_dir
+        if not directory:
+            return None
+        
+        key = (str(Path(directory).resolve()), model_id)
+        with _DISK_STORES_LOCK:
+            if key not in _DISK_STORES:
+                store = None
+                try:
+                    store = EmbeddingDiskStore(directory, model_id)
+                except Exception as e:
+                    self.logger.warning(f"Embedding disk cache unavailable: {e}")
+                _DISK_STORES[key] = store
+            return _DISK_STORES[key]
+
+    def _read_from_disk(self, key: Tuple[str, bytes]) -> Optional[Tuple[np.ndarray, float]]:
+        store = self._disk_store(key[0])
+        if store is None:
+            return None
+        try:
+            return store.get(key[1])
+        except Exception as e:
+            self.logger.warning(f"Embedding disk cache read failed: {e}")
+            return None
+
+    def _write_to_disk(self, key: Tuple[str, bytes], embedding: Tuple[np.ndarray, float]):
+        store = self._disk_store(key[0])
+        if store is None:
+            return
+        try:
+            store.put(key[1], *embedding)
+        except Exception as e:
+            self.logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def _add_to_cache(self, key: Tuple[str, bytes], embedding: Tuple[np.ndarray, float]):
+        # Caller holds _cache_lock
         if len(self.embeddings_cache) >= self._max_cache_size:
             self.embeddings_cache.popitem(last=False)
         
-        self.embeddings_cache[text] = embedding
-
-    def _get_standard_metrics(self) -> List[str]:
-        return [
-            'Total Assets', 'Current Assets', 'Non-current Assets',
-            'Cash and Cash Equivalents', 'Inventory', 'Trade Receivables',
-            'Property Plant and Equipment', 'Total Liabilities',
-            'Current Liabilities', 'Non-current Liabilities',
-            'Total Equity', 'Share Capital', 'Retained Earnings',
-            'Revenue', 'Cost of Goods Sold', 'Gross Profit',
-            'Operating Expenses', 'Operating Income', 'Net Income',
-            'Earnings Per Share', 'Operating Cash Flow',
-            'Investing Cash Flow', 'Financing Cash Flow',
-            'EBIT', 'EBITDA', 'Interest Expense', 'Tax Expense'
-        ]
+        self.embeddings_cache[key] = embedding
+
+    def _get_standard_metrics(self) -> Tuple[str, ...]:
+        return _STANDARD_METRICS
 
     def get_api_status(self) -> Dict[str, Any]:
         return {
@@ -308,6 +541,169 @@ class AIService:
         }
 
 
+class EmbeddingDiskStore:
+    # One store per model: int8 rows in a .dat file memory-mapped for reads, and a .idx file
+    # of (digest, scale, dim) records in the same row order. Shared process-wide through
+    # _DISK_STORES; its own lock serializes every reader and writer
+    _RECORD = np.dtype([('digest', 'V16'), ('scale', '<f4'), ('dim', '<u4')])
+
+    def __init__(self, directory: str, model_id: str):
+        base = Path(directory)
+        base.mkdir(parents=True, exist_ok=True)
+        name = hashlib.blake2b(model_id.encode('utf-8'), digest_size=8).hexdigest()
+        self._index_path = base / f"{name}.idx"
+        self._data_path = base / f"{name}.dat"
+        
+        self._rows: Dict[bytes, Tuple[int, float]] = {}
+        self._dim: Optional[int] = None
+        self._count = 0
+        self._data: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self._index_path.exists() or not self._data_path.exists():
+            return
+        
+        records = np.fromfile(self._index_path, dtype=self._RECORD)
+        if not len(records):
+            return
+        
+        # Ignore records whose row never fully reached the data file
+        dim = int(records['dim'][0])
+        records = records[:self._data_path.stat().st_size // dim]
+        
+        self._dim = dim
+        self._count = len(records)
+        for row, (digest, scale, _) in enumerate(records):
+            self._rows[bytes(digest)] = (row, float(scale))
+
+    def get(self, digest: bytes) -> Optional[Tuple[np.ndarray, float]]:
+        with self._lock:
+            entry = self._rows.get(digest)
+            if entry is None:
+                return None
+            
+            row, scale = entry
+            if self._data is None or row >= self._data.shape[0]:
+                # Remap to pick up rows appended since the last mapping
+                self._data = np.memmap(self._data_path, dtype=np.int8, mode='r', shape=(self._count, self._dim))
+            return np.array(self._data[row]), scale
+
+    def put(self, digest: bytes, quantized: np.ndarray, scale: float):
+        with self._lock:
+            if digest in self._rows:
+                return
+            if self._dim is None:
+                self._dim = int(quantized.size)
+            elif quantized.size != self._dim:
+                return
+            
+            # Write both files positionally so a torn earlier write is overwritten, not appended after
+            row = self._count
+            record = np.array([(digest, scale, self._dim)], dtype=self._RECORD)
+            self._write_at(self._data_path, row * self._dim, quantized.astype(np.int8).tobytes())
+            self._write_at(self._index_path, row * self._RECORD.itemsize, record.tobytes())
+            
+            self._rows[digest] = (row, float(scale))
+            self._count += 1
+
+    @staticmethod
+    def _write_at(path: Path, offset: int, payload: bytes):
+        with open(path, 'r+b' if path.exists() else 'wb') as f:
+            f.seek(offset)
+            f.write(payload)
+            f.truncate()
+
+
+class _KagglePipeline:
+    # Bounded, priority-ordered /embed queue with a small worker pool, shared by every AIService
+    # talking to one endpoint so concurrent sessions' mapping calls can share a POST. Workers only
+    # hold the pipeline, never a service, so sessions ending leave nothing behind
+    def __init__(self, api_client: 'KaggleAPIClient', batch_size: int):
+        self._api_client = api_client
+        self._batch_size = max(1, batch_size)
+        self._queue: queue.PriorityQueue = queue.PriorityQueue(maxsize=256)
+        self._seq = itertools.count()
+        self._max_batch_requests = 32
+        self.logger = logging.getLogger(__name__)
+        
+        for i in range(3):
+            threading.Thread(target=self._worker, name=f"ai-request-{i}", daemon=True).start()
+
+    def submit(self, request: AIRequest) -> bool:
+        try:
+            # Sequence number breaks ties without ever comparing requests
+            self._queue.put_nowait((request.priority, request.timestamp, next(self._seq), request))
+            return True
+        except queue.Full:
+            return False
+
+    def _worker(self):
+        carried = None
+        while True:
+            item = carried or self._queue.get()
+            carried = None
+            batch = [item[-1]]
+            
+            # Coalesce queued /embed requests into one POST, up to the API's batch size
+            if self._is_embed_request(batch[0]):
+                batch_texts = len(batch[0].data['texts'])
+                while len(batch) < self._max_batch_requests:
+                    try:
+                        queued = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    request = queued[-1]
+                    if (not self._is_embed_request(request)
+                            or batch_texts + len(request.data['texts']) > self._batch_size):
+                        carried = queued
+                        break
+                    batch.append(request)
+                    batch_texts += len(request.data['texts'])
+            
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                self.logger.error(f"AI request pipeline error: {e}")
+                for request in batch:
+                    self._complete(request, None)
+
+    @staticmethod
+    def _is_embed_request(request: AIRequest) -> bool:
+        return request.method == 'POST' and request.endpoint == '/embed' and bool(request.data) and 'texts' in request.data
+
+    def _dispatch(self, batch: List[AIRequest]):
+        if len(batch) == 1 and not self._is_embed_request(batch[0]):
+            request = batch[0]
+            self._complete(request, self._api_client.make_request(request.method, request.endpoint, request.data))
+            return
+        
+        texts = [text for request in batch for text in request.data['texts']]
+        response = self._api_client.make_request('POST', '/embed', {'texts': texts}, timeout=10)
+        embeddings = response.get('embeddings') if response else None
+        
+        if not embeddings or len(embeddings) != len(texts):
+            for request in batch:
+                self._complete(request, None)
+            return
+        
+        # Hand each caller back its own slice of the combined response
+        offset = 0
+        for request in batch:
+            count = len(request.data['texts'])
+            self._complete(request, {**response, 'embeddings': embeddings[offset:offset + count]})
+            offset += count
+
+    def _complete(self, request: AIRequest, response: Optional[Dict]):
+        if request.callback is None:
+            return
+        try:
+            request.callback(response)
+        except Exception as e:
+            self.logger.error(f"AI request callback error for {request.id}: {e}")
+
+
 class KaggleAPIClient:
     def __init__(self, base_url: str, config):
         self.base_url = base_url.rstrip('/')
@@ -322,6 +718,24 @@ class KaggleAPIClient:
             'ngrok-skip-browser-warning': 'true'
         })
         
+        # Keep-alive pool sized for concurrent embedding calls; transient gateway errors are
+        # retried with backoff. /embed is idempotent, so POST is safe to retry
+        retry = Retry(
+            total=self.config.ai.kaggle_max_retries,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # TLS verification is configured once for the session, not per request
+        self.session.verify = self.config.ai.kaggle_verify_ssl
+        if not self.config.ai.kaggle_verify_ssl:
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        
         if self.config.ai.kaggle_api_key:
             self.session.headers['Authorization'] = f'Bearer {self.config.ai.kaggle_api_key}'
 
@@ -330,17 +744,7 @@ class KaggleAPIClient:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
             timeout = timeout or self.config.ai.kaggle_api_timeout
             
-            kwargs = {
-                'method': method,
-                'url': url,
-                'timeout': timeout,
-                'verify': False
-            }
-            
-            if data:
-                kwargs['json'] = data
-            
-            response = self.session.request(**kwargs)
+            response = self.session.request(method, url, json=data or None, timeout=timeout)
             
             if response.status_code == 200:
                 return response.json()
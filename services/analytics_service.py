@@ -1,6 +1,7 @@
 import logging
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional
 from financial_analytics_core import (
     FinancialRatioCalculator,
     PenmanNissimAnalyzer,
@@ -8,6 +9,55 @@ from financial_analytics_core import (
     DataProcessor as CoreDataProcessor
 )
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_KEY_METRIC_PATTERNS = {
+    'revenue': ('revenue', 'sales', 'turnover'),
+    'net_income': ('net income', 'net profit', 'profit after tax'),
+    'total_assets': ('total assets', 'sum of assets'),
+    'total_equity': ('total equity', 'shareholders equity')
+}
+
+_POSITIVE_METRIC_KEYWORDS = ('revenue', 'assets', 'equity')
+
+
+class _NumericView(NamedTuple):
+    frame: pd.DataFrame
+    values: np.ndarray
+    columns: pd.Index
+
+
+def _ratio_numpy(num: np.ndarray, den: np.ndarray, scale: float) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = num / den * scale
+    out[np.isnan(out)] = 0.0
+    return out
+
+
+if njit is not None:
+    # Compiled eagerly against a fixed signature and cached on disk, so no JIT on first analysis
+    @njit('float64[:](float64[:], float64[:], float64)', cache=True, error_model='numpy')
+    def _ratio_kernel(num, den, scale):
+        out = np.empty(num.shape[0])
+        for i in range(num.shape[0]):
+            r = num[i] / den[i] * scale
+            out[i] = 0.0 if np.isnan(r) else r
+        return out
+else:
+    _ratio_kernel = _ratio_numpy
+
+
+def _safe_ratio(num: pd.Series, den: pd.Series, scale: float = 1.0) -> pd.Series:
+    values = _ratio_kernel(
+        num.to_numpy(dtype=np.float64),
+        den.to_numpy(dtype=np.float64),
+        scale
+    )
+    return pd.Series(values, index=num.index, copy=False)
+
 
 class AnalyticsService:
     def __init__(self, config_manager, state_manager, event_system):
@@ -20,19 +70,29 @@ class AnalyticsService:
         self.ratio_calculator = FinancialRatioCalculator()
         self.industry_benchmarks = IndustryBenchmarks()
         self.data_processor = CoreDataProcessor()
+        
+        self._lowered_index_cache = None
+        self._numeric_view_cache = None
 
     def analyze_financial_statements(self, data: pd.DataFrame) -> Dict[str, Any]:
         try:
             self.events.publish("analysis_started", {"data_shape": data.shape}, "AnalyticsService")
             
+            # Select and materialize the numeric columns once for every helper below
+            self._numeric_view_cache = (data, self._build_numeric_view(data))
+            
+            # Trends and quality feed the insights, so compute them once up front
+            trends = self._analyze_trends(data)
+            quality_score = self._calculate_quality_score(data)
+            
             # Generate analysis
             analysis = {
                 'summary': self._generate_summary(data),
                 'metrics': self._extract_key_metrics(data),
                 'ratios': self._calculate_ratios(data),
-                'trends': self._analyze_trends(data),
-                'quality_score': self._calculate_quality_score(data),
-                'insights': self._generate_insights(data),
+                'trends': trends,
+                'quality_score': quality_score,
+                'insights': self._generate_insights(data, trends, quality_score),
                 'anomalies': self._detect_anomalies(data)
             }
             
@@ -43,6 +103,20 @@ class AnalyticsService:
             self.logger.error(f"Analysis failed: {e}")
             self.events.publish("analysis_failed", {"error": str(e)}, "AnalyticsService")
             return {"error": str(e)}
+        finally:
+            self._numeric_view_cache = None
+
+    def _numeric_view(self, df: pd.DataFrame) -> _NumericView:
+        # Only reused within one analyze_financial_statements call, so in-place edits between calls can't go stale
+        cached = self._numeric_view_cache
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        return self._build_numeric_view(df)
+
+    @staticmethod
+    def _build_numeric_view(df: pd.DataFrame) -> _NumericView:
+        numeric_df = df.select_dtypes(include=['number'])
+        return _NumericView(numeric_df, numeric_df.to_numpy(dtype=np.float64), numeric_df.columns)
 
     def _generate_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
         summary = {
@@ -53,16 +127,16 @@ class AnalyticsService:
             'key_statistics': {}
         }
         
-        numeric_df = df.select_dtypes(include=['number'])
+        view = self._numeric_view(df)
         
-        if not numeric_df.empty:
-            total_cells = numeric_df.shape[0] * numeric_df.shape[1]
-            non_null_cells = numeric_df.notna().sum().sum()
-            completeness = (non_null_cells / total_cells) * 100 if total_cells > 0 else 0
+        if view.values.size:
+            total_cells = view.values.size
+            non_null_cells = int((~np.isnan(view.values)).sum())
+            completeness = (non_null_cells / total_cells) * 100
             
             summary.update({
-                'years_covered': len(numeric_df.columns),
-                'year_range': f"{numeric_df.columns[0]} - {numeric_df.columns[-1]}" if len(numeric_df.columns) > 0 else "N/A",
+                'years_covered': len(view.columns),
+                'year_range': f"{view.columns[0]} - {view.columns[-1]}",
                 'completeness': completeness,
             })
         
@@ -73,26 +147,14 @@ class AnalyticsService:
         metrics = {}
         
         # Look for common financial metrics
-        metric_patterns = {
-            'revenue': ['revenue', 'sales', 'turnover'],
-            'net_income': ['net income', 'net profit', 'profit after tax'],
-            'total_assets': ['total assets', 'sum of assets'],
-            'total_equity': ['total equity', 'shareholders equity']
-        }
-        
-        for metric_type, patterns in metric_patterns.items():
-            for idx in df.index:
-                idx_lower = str(idx).lower()
-                for pattern in patterns:
-                    if pattern in idx_lower:
-                        metrics[metric_type] = [{
-                            'name': str(idx),
-                            'confidence': 0.9,
-                            'values': df.loc[idx].to_dict()
-                        }]
-                        break
-                if metric_type in metrics:
-                    break
+        for metric_type, patterns in _KEY_METRIC_PATTERNS.items():
+            pos = self._first_matching_row(df, patterns)
+            if pos is not None:
+                metrics[metric_type] = [{
+                    'name': str(df.index[pos]),
+                    'confidence': 0.9,
+                    'values': df.iloc[pos].to_dict()
+                }]
         
         return metrics
 
@@ -111,12 +173,12 @@ class AnalyticsService:
             
             # Calculate profitability ratios
             if revenue is not None and net_income is not None:
-                npm = (net_income / revenue * 100).fillna(0)
+                npm = _safe_ratio(net_income, revenue, 100.0)
                 ratios['Profitability'] = pd.DataFrame({'Net Profit Margin %': npm})
             
             # Calculate liquidity ratios
             if current_assets is not None and current_liabilities is not None:
-                current_ratio = (current_assets / current_liabilities).fillna(0)
+                current_ratio = _safe_ratio(current_assets, current_liabilities)
                 ratios['Liquidity'] = pd.DataFrame({'Current Ratio': current_ratio})
             
             return ratios
@@ -126,61 +188,78 @@ class AnalyticsService:
             return {}
 
     def _find_metric_value(self, df: pd.DataFrame, patterns: list) -> Optional[pd.Series]:
-        for idx in df.index:
-            idx_lower = str(idx).lower()
-            for pattern in patterns:
-                if pattern in idx_lower:
-                    return df.loc[idx]
-        return None
+        pos = self._first_matching_row(df, patterns)
+        return df.iloc[pos] if pos is not None else None
+
+    def _first_matching_row(self, df: pd.DataFrame, patterns) -> Optional[int]:
+        hits = np.flatnonzero(self._label_mask(df, patterns))
+        return int(hits[0]) if hits.size else None
+
+    def _label_mask(self, df: pd.DataFrame, patterns) -> np.ndarray:
+        lowered = self._lowered_index(df)
+        mask = np.zeros(len(lowered), dtype=bool)
+        for pattern in patterns:
+            mask |= np.char.find(lowered, pattern) >= 0
+        return mask
+
+    def _lowered_index(self, df: pd.DataFrame) -> np.ndarray:
+        # Lowered once per index; holding the Index itself keeps the identity check sound
+        cached = self._lowered_index_cache
+        if cached is None or cached[0] is not df.index:
+            lowered = np.asarray(df.index.astype(str).str.lower(), dtype=str)
+            cached = self._lowered_index_cache = (df.index, lowered)
+        return cached[1]
 
     def _analyze_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
         trends = {}
-        numeric_df = df.select_dtypes(include=['number'])
+        view = self._numeric_view(df)
         
-        if len(numeric_df.columns) < 2:
+        if len(view.columns) < 2:
             return {'error': 'Insufficient data for trend analysis'}
         
-        for idx in numeric_df.index:
-            series = numeric_df.loc[idx].dropna()
+        values = view.values
+        observed = ~np.isnan(values)
+        counts = observed.sum(axis=1)
+        
+        # Shift each row's observed values to the front, in order, so every row is
+        # treated exactly like its dropna()'d series
+        order = np.argsort(~observed, axis=1, kind='stable')
+        packed = np.take_along_axis(values, order, axis=1)
+        positions = np.arange(values.shape[1])
+        in_series = positions < counts[:, None]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Closed-form least-squares slope against x = 0..n-1
+            x_dev = np.where(in_series, positions - (counts[:, None] - 1) / 2, 0.0)
+            slopes = (x_dev * np.where(in_series, packed, 0.0)).sum(axis=1) / (x_dev ** 2).sum(axis=1)
             
-            if len(series) >= 3:
-                import numpy as np
-                years = range(len(series))
-                values = series.values
-                
-                # Linear regression
-                coefficients = np.polyfit(years, values, 1)
-                slope = float(coefficients[0])
-                
-                # CAGR calculation
-                try:
-                    first_value = float(series.iloc[0])
-                    last_value = float(series.iloc[-1])
-                    
-                    if first_value > 0 and last_value > 0:
-                        years_diff = len(series) - 1
-                        if years_diff > 0:
-                            cagr = ((last_value / first_value) ** (1 / years_diff) - 1) * 100
-                        else:
-                            cagr = 0
-                    else:
-                        cagr = 0
-                except:
-                    cagr = 0
-                
-                # Volatility
-                try:
-                    volatility = float(series.pct_change().std() * 100)
-                    if pd.isna(volatility):
-                        volatility = 0
-                except:
-                    volatility = 0
-                
+            # CAGR between the first and last observed values
+            first = packed[:, 0]
+            last = packed[np.arange(len(packed)), np.maximum(counts - 1, 0)]
+            periods = counts - 1
+            cagr = np.where(
+                (first > 0) & (last > 0) & (periods > 0),
+                ((last / first) ** (1 / periods) - 1) * 100,
+                0.0
+            )
+            
+            # Volatility: sample std of period-over-period changes, skipping the NaN a 0 -> 0
+            # step produces the way Series.std() does
+            changes = packed[:, 1:] / packed[:, :-1] - 1
+            in_changes = in_series[:, 1:] & ~np.isnan(changes)
+            change_counts = in_changes.sum(axis=1)
+            mean_change = np.where(in_changes, changes, 0.0).sum(axis=1) / change_counts
+            squared_dev = np.where(in_changes, (changes - mean_change[:, None]) ** 2, 0.0)
+            volatility = np.sqrt(squared_dev.sum(axis=1) / (change_counts - 1)) * 100
+            volatility = np.where(np.isnan(volatility), 0.0, volatility)
+        
+        for idx, count, slope, growth, vol in zip(view.frame.index, counts, slopes, cagr, volatility):
+            if count >= 3:
                 trends[str(idx)] = {
-                    'slope': slope,
+                    'slope': float(slope),
                     'direction': 'increasing' if slope > 0 else 'decreasing',
-                    'cagr': cagr,
-                    'volatility': volatility,
+                    'cagr': float(growth),
+                    'volatility': float(vol),
                     'r_squared': 0.8  # Simplified for now
                 }
         
@@ -194,26 +273,19 @@ class AnalyticsService:
         scores.append(completeness)
         
         # Consistency score
-        numeric_df = df.select_dtypes(include=['number'])
-        if not numeric_df.empty:
-            consistency_score = 100
-            # Check for negative values in positive metrics
-            positive_metrics = ['revenue', 'assets', 'equity']
-            for idx in numeric_df.index:
-                if any(keyword in str(idx).lower() for keyword in positive_metrics):
-                    negative_count = int((numeric_df.loc[idx] < 0).sum())
-                    if negative_count > 0:
-                        consistency_score -= (negative_count / len(numeric_df.columns)) * 20
+        view = self._numeric_view(df)
+        if view.values.size:
+            # Check for negative values in positive metrics; numeric rows line up with df's
+            positive_rows = self._label_mask(df, _POSITIVE_METRIC_KEYWORDS)
+            negative_count = int((view.values[positive_rows] < 0).sum())
+            consistency_score = 100 - (negative_count / len(view.columns)) * 20
             scores.append(max(0, consistency_score))
         
         return sum(scores) / len(scores) if scores else 0
 
-    def _generate_insights(self, df: pd.DataFrame) -> list:
+    def _generate_insights(self, df: pd.DataFrame, trends: Dict[str, Any], quality_score: float) -> list:
         insights = []
         
-        # Analyze trends
-        trends = self._analyze_trends(df)
-        
         # Revenue insights
         revenue_trends = [v for k, v in trends.items() if 'revenue' in k.lower()]
         if revenue_trends and revenue_trends[0].get('cagr') is not None:
@@ -224,7 +296,6 @@ class AnalyticsService:
                 insights.append("📉 Revenue decline trend observed")
         
         # Quality insights
-        quality_score = self._calculate_quality_score(df)
         if quality_score < 70:
             insights.append("⚠️ Data quality issues detected")
         
@@ -237,30 +308,39 @@ class AnalyticsService:
             'ratio_anomalies': []
         }
         
-        numeric_df = df.select_dtypes(include=['number'])
+        view = self._numeric_view(df)
+        
+        if not view.values.size:
+            return anomalies
+        
+        # Value anomalies using IQR method, over every column with enough observations at once
+        values = view.values
+        eligible = np.flatnonzero((~np.isnan(values)).sum(axis=0) > 4)
+        if not eligible.size:
+            return anomalies
         
-        # Value anomalies using IQR method
-        for col in numeric_df.columns:
-            series = numeric_df[col].dropna()
-            if len(series) > 4:
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                
-                if IQR > 0:
-                    lower_bound = Q1 - 3 * IQR
-                    upper_bound = Q3 + 3 * IQR
-                    
-                    anomaly_mask = (series < lower_bound) | (series > upper_bound)
-                    anomaly_indices = series[anomaly_mask].index
-                    
-                    for idx in anomaly_indices:
-                        anomalies['value_anomalies'].append({
-                            'metric': str(idx),
-                            'year': str(col),
-                            'value': float(series[idx]),
-                            'lower_bound': lower_bound,
-                            'upper_bound': upper_bound
-                        })
+        sub = values[:, eligible]
+        # nanquantile loops over the columns in Python, so only use it when there are gaps
+        quantile = np.nanquantile if np.isnan(sub).any() else np.quantile
+        Q1, Q3 = quantile(sub, [0.25, 0.75], axis=0)
+        
+        with np.errstate(invalid='ignore'):
+            IQR = Q3 - Q1
+            lower_bound = Q1 - 3 * IQR
+            upper_bound = Q3 + 3 * IQR
+            
+            # NaN compares False, so missing cells never flag
+            anomaly_mask = ((sub < lower_bound) | (sub > upper_bound)) & (IQR > 0)
+        
+        # Transposed so anomalies come out column by column, as before
+        cols, rows = np.nonzero(anomaly_mask.T)
+        for col, row in zip(cols, rows):
+            anomalies['value_anomalies'].append({
+                'metric': str(view.frame.index[row]),
+                'year': str(view.columns[eligible[col]]),
+                'value': float(sub[row, col]),
+                'lower_bound': float(lower_bound[col]),
+                'upper_bound': float(upper_bound[col])
+            })
         
         return anomalies
@@ -1,9 +1,11 @@
+import heapq
+import itertools
 import logging
-import hashlib
+import secrets
 import time
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
+from collections import defaultdict, deque
 
 
 class CollaborationService:
@@ -16,19 +18,26 @@ class CollaborationService:
         self.active_sessions = {}
         self.shared_analyses = {}
         self.user_presence = defaultdict(dict)
+        
+        # (last_activity, session_id) pushed on every touch; entries whose timestamp no longer
+        # matches the session are stale and skipped during cleanup
+        self._activity_heap: List[Tuple[datetime, str]] = []
+        self._session_timeout = timedelta(seconds=3600)
+        self._max_log_entries = 1000  # Chat and access logs keep only the most recent entries
 
     def create_session(self, analysis_id: str, owner_id: str) -> str:
-        session_id = hashlib.md5(f"{analysis_id}_{owner_id}_{time.time()}".encode()).hexdigest()[:8]
+        session_id = secrets.token_hex(4)
         
         self.active_sessions[session_id] = {
             'analysis_id': analysis_id,
             'owner': owner_id,
-            'participants': [owner_id],
+            'participants': {owner_id: None},  # Insertion-ordered set
             'created_at': datetime.now(),
-            'last_activity': datetime.now(),
-            'chat_history': [],
+            'last_activity': None,
+            'chat_history': deque(maxlen=self._max_log_entries),
             'annotations': {}
         }
+        self._touch(session_id)
         
         self.events.publish("session_created", {
             'session_id': session_id,
@@ -44,10 +53,8 @@ class CollaborationService:
         
         session = self.active_sessions[session_id]
         
-        if user_id not in session['participants']:
-            session['participants'].append(user_id)
-        
-        session['last_activity'] = datetime.now()
+        session['participants'][user_id] = None
+        self._touch(session_id)
         
         self.user_presence[session_id][user_id] = {
             'joined_at': datetime.now(),
@@ -68,14 +75,14 @@ class CollaborationService:
         if permissions is None:
             permissions = ['view', 'comment']
         
-        share_token = hashlib.md5(f"{owner_id}_{time.time()}".encode()).hexdigest()[:12]
+        share_token = secrets.token_hex(6)
         
         self.shared_analyses[share_token] = {
             'data': analysis_data,
             'owner': owner_id,
             'permissions': permissions,
             'created_at': datetime.now(),
-            'access_log': []
+            'access_log': deque(maxlen=self._max_log_entries)
         }
         
         self.events.publish("analysis_shared", {
@@ -115,7 +122,7 @@ class CollaborationService:
             'position': annotation.get('position', None)
         }
         
-        session['last_activity'] = datetime.now()
+        self._touch(session_id)
         
         self.events.publish("annotation_added", {
             'session_id': session_id,
@@ -137,7 +144,7 @@ class CollaborationService:
             'timestamp': datetime.now()
         })
         
-        session['last_activity'] = datetime.now()
+        self._touch(session_id)
         
         self.events.publish("chat_message_added", {
             'session_id': session_id,
@@ -152,26 +159,33 @@ class CollaborationService:
         
         session = self.active_sessions[session_id]
         presence = self.user_presence.get(session_id, {})
+        chat = session['chat_history']
         
         return {
-            'participants': session['participants'],
+            'participants': list(session['participants']),
             'active_users': [
                 uid for uid, data in presence.items()
                 if (datetime.now() - data['last_seen']).seconds < 300
             ],
             'annotations': session['annotations'],
-            'chat_history': session['chat_history'][-50:]  # Last 50 messages
+            'chat_history': list(itertools.islice(chat, max(0, len(chat) - 50), None))  # Last 50 messages
         }
 
+    def _touch(self, session_id: str):
+        now = datetime.now()
+        self.active_sessions[session_id]['last_activity'] = now
+        heapq.heappush(self._activity_heap, (now, session_id))
+
     def cleanup_inactive_sessions(self):
-        current_time = datetime.now()
-        inactive_sessions = []
-        
-        for session_id, session in self.active_sessions.items():
-            if (current_time - session['last_activity']).seconds > 3600:
-                inactive_sessions.append(session_id)
-        
-        for session_id in inactive_sessions:
+        cutoff = datetime.now() - self._session_timeout
+        
+        # Only entries older than the cutoff are examined, oldest first
+        while self._activity_heap and self._activity_heap[0][0] < cutoff:
+            last_activity, session_id = heapq.heappop(self._activity_heap)
+            session = self.active_sessions.get(session_id)
+            if session is None or session['last_activity'] != last_activity:
+                continue
+            
             del self.active_sessions[session_id]
             if session_id in self.user_presence:
                 del self.user_presence[session_id]
@@ -1,9 +1,23 @@
 import logging
+import re
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 from financial_analytics_core import DataProcessor as CoreDataProcessor
 
+# Checked in order; the first match wins
+_STATEMENT_PATTERNS = (
+    (re.compile(r'profit|loss|income|p&l'), "ProfitLoss"),
+    (re.compile(r'balance|sheet'), "BalanceSheet"),
+    (re.compile(r'cash|flow'), "CashFlow"),
+    (re.compile(r'equity|changes'), "Equity"),
+)
+
+# Items that should always be positive
+_ALWAYS_POSITIVE_RE = re.compile(
+    r'total assets|total equity|revenue from operations|gross revenue|net revenue|total revenue'
+)
+
 
 class DataService:
     def __init__(self, config_manager, state_manager, event_system):
@@ -21,14 +35,16 @@ class DataService:
             
             # Clean and validate data
             cleaned_df = self._clean_dataframe(df)
-            validation_result = self._validate_dataframe(cleaned_df)
+            # Auto-corrections only flip signs of present values, so one null count serves both passes
+            missing = self._count_missing(cleaned_df)
+            validation_result = self._validate_dataframe(cleaned_df, missing)
             
-            # Apply auto-corrections if enabled
+            # Apply auto-corrections if enabled; cleaned_df is already our own copy
             if self.config.analysis.enable_auto_correction:
-                cleaned_df = self._apply_auto_corrections(cleaned_df)
+                cleaned_df = self._apply_auto_corrections(cleaned_df, inplace=True)
             
             # Calculate data quality metrics
-            quality_metrics = self._calculate_quality_metrics(cleaned_df)
+            quality_metrics = self._calculate_quality_metrics(cleaned_df, missing)
             
             result = {
                 'validation': validation_result,
@@ -49,29 +65,33 @@ class DataService:
             return df, {"error": str(e)}
 
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        cleaned_df = df.copy()
-        
-        # Remove unnamed columns
-        unnamed_cols = [col for col in cleaned_df.columns if 'Unnamed' in str(col)]
-        if unnamed_cols:
-            cleaned_df = cleaned_df.drop(columns=unnamed_cols)
+        # Remove unnamed columns; drop() also gives us the working copy
+        unnamed_mask = df.columns.astype(str).str.contains('Unnamed', regex=False)
+        cleaned_df = df.drop(columns=df.columns[unnamed_mask])
         
-        # Convert numeric columns
-        for col in cleaned_df.columns:
+        # Convert numeric columns. Already-numeric columns need no work, and coercion turns
+        # placeholders like '-', '', 'NA' and 'None' into NaN on its own
+        non_numeric = cleaned_df.columns.difference(
+            cleaned_df.select_dtypes(include=[np.number]).columns, sort=False
+        )
+        converted = {}
+        for col in non_numeric:
             try:
-                cleaned_df[col] = cleaned_df[col].replace({
-                    '-': np.nan,
-                    '': np.nan,
-                    'NA': np.nan,
-                    'None': np.nan
-                })
-                cleaned_df[col] = pd.to_numeric(cleaned_df[col], errors='coerce')
+                converted[col] = pd.to_numeric(cleaned_df[col], errors='coerce')
             except Exception as e:
                 self.logger.warning(f"Could not convert column {col} to numeric: {e}")
         
+        # One block-level assignment instead of one per column
+        if converted:
+            cleaned_df[list(converted)] = pd.DataFrame(converted, index=cleaned_df.index)
+        
         return cleaned_df
 
-    def _validate_dataframe(self, df: pd.DataFrame) -> Dict[str, Any]:
+    @staticmethod
+    def _count_missing(df: pd.DataFrame) -> int:
+        return int(df.isna().to_numpy().sum())
+
+    def _validate_dataframe(self, df: pd.DataFrame, missing: Optional[int] = None) -> Dict[str, Any]:
         validation = {
             'is_valid': True,
             'errors': [],
@@ -86,49 +106,45 @@ class DataService:
             return validation
         
         # Check missing values
-        missing_pct = (df.isnull().sum().sum() / df.size) * 100
+        if missing is None:
+            missing = self._count_missing(df)
+        missing_pct = (missing / df.size) * 100
         if missing_pct > 50:
             validation['warnings'].append(f"High percentage of missing values ({missing_pct:.1f}%)")
         elif missing_pct > 20:
             validation['info'].append(f"Moderate missing values ({missing_pct:.1f}%)")
         
         # Check for duplicate indices
-        if df.index.duplicated().any():
-            dup_count = df.index.duplicated().sum()
+        dup_count = int(df.index.duplicated().sum())
+        if dup_count:
             validation['warnings'].append(f"{dup_count} duplicate indices found")
         
         return validation
 
-    def _apply_auto_corrections(self, df: pd.DataFrame) -> pd.DataFrame:
-        corrected_df = df.copy()
-        
-        # Define items that should always be positive
-        always_positive_keywords = [
-            'total assets', 'total equity', 'revenue from operations',
-            'gross revenue', 'net revenue', 'total revenue'
-        ]
+    def _apply_auto_corrections(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        corrected_df = df if inplace else df.copy()
         
-        for idx in corrected_df.index:
-            idx_lower = str(idx).lower()
-            
-            if any(keyword in idx_lower for keyword in always_positive_keywords):
-                row_data = corrected_df.loc[idx]
-                try:
-                    numeric_data = pd.to_numeric(row_data, errors='coerce')
-                    negative_mask = numeric_data < 0
-                    if negative_mask.any():
-                        corrected_df.loc[idx][negative_mask] = abs(numeric_data[negative_mask])
-                except Exception as e:
-                    self.logger.warning(f"Error processing {idx}: {e}")
+        row_mask = corrected_df.index.astype(str).str.lower().str.contains(_ALWAYS_POSITIVE_RE)
+        if row_mask.any():
+            try:
+                rows = corrected_df.loc[row_mask]
+                numeric_rows = rows.apply(pd.to_numeric, errors='coerce')
+                negative_mask = numeric_rows < 0
+                # Column-wise so each column keeps its own dtype
+                for col in negative_mask.columns[negative_mask.any()]:
+                    corrected_df.loc[row_mask, col] = rows[col].mask(negative_mask[col], numeric_rows[col].abs())
+            except Exception as e:
+                self.logger.warning(f"Error applying auto-corrections: {e}")
         
         return corrected_df
 
-    def _calculate_quality_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_quality_metrics(self, df: pd.DataFrame, missing: Optional[int] = None) -> Dict[str, Any]:
         total = df.size
         if total == 0:
             return {'total_rows': 0, 'missing_values': 0, 'missing_percentage': 0.0, 'duplicate_rows': 0}
         
-        missing = int(df.isnull().sum().sum())
+        if missing is None:
+            missing = self._count_missing(df)
         duplicate_rows = int(df.duplicated().sum())
         missing_pct = (missing / total) * 100 if total > 0 else 0.0
         
@@ -148,19 +164,20 @@ class DataService:
             if len(dataframes) == 1:
                 return dataframes[0]
             
-            # Process each dataframe
+            # Relabel each frame without copying it; concat builds the only new frame
             processed_dfs = []
-            for i, df in enumerate(dataframes):
-                df_copy = df.copy()
-                statement_type = self._detect_statement_type(df_copy)
-                
-                # Create unique indices
-                new_index = [f"{statement_type}::{str(idx).strip()}" for idx in df_copy.index]
-                df_copy.index = new_index
-                processed_dfs.append(df_copy)
+            for df in dataframes:
+                statement_type = self._detect_statement_type(df)
+                new_index = f"{statement_type}::" + df.index.astype(str).str.strip()
+                processed_dfs.append(df.set_axis(new_index, axis=0, copy=False))
             
             # Concatenate all dataframes
-            merged_df = pd.concat(processed_dfs, axis=0, sort=False)
+            merged_df = pd.concat(processed_dfs, axis=0, sort=False, copy=False)
+            
+            # Labels repeated across statements share one string object instead of a copy each
+            codes, uniques = pd.factorize(merged_df.index)
+            if len(uniques) < len(codes):
+                merged_df.index = uniques.take(codes).rename(merged_df.index.name)
             return merged_df
             
         except Exception as e:
@@ -172,14 +189,4 @@ class DataService:
             return "Financial"
         
         col_sample = str(df.columns[0]).lower()
-        
-        if any(keyword in col_sample for keyword in ['profit', 'loss', 'income', 'p&l']):
-            return "ProfitLoss"
-        elif any(keyword in col_sample for keyword in ['balance', 'sheet']):
-            return "BalanceSheet"
-        elif any(keyword in col_sample for keyword in ['cash', 'flow']):
-            return "CashFlow"
-        elif any(keyword in col_sample for keyword in ['equity', 'changes']):
-            return "Equity"
-        else:
-            return "Financial"
+        return next((label for pattern, label in _STATEMENT_PATTERNS if pattern.search(col_sample)), "Financial")
@@ -1,12 +1,27 @@
+import codecs
 import io
 import logging
+import os
 import pandas as pd
 import zipfile
 import tempfile
 import shutil
+from collections import deque
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import BinaryIO, Iterator, List, Tuple, Optional
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Direct rows only, so a nested table's rows are not credited to its parent
+_TABLE_ROWS_XPATH = './tr|./thead/tr|./tbody/tr|./tfoot/tr'
+
+_CSV_ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+_SNIFF_CHUNK_SIZE = 1 << 20
 
 
 class FileService:
@@ -76,54 +91,60 @@ class FileService:
 
     def _process_compressed_file(self, file) -> List[pd.DataFrame]:
         dataframes = []
-        temp_dir = Path(tempfile.mkdtemp())
-        self.temp_dirs.append(temp_dir)
         
         try:
-            # Save uploaded file to temp location
-            temp_file = temp_dir / file.name
-            with open(temp_file, 'wb') as f:
-                f.write(file.getbuffer())
-            
             if file.name.lower().endswith('.zip'):
-                extracted_files = self._extract_zip(temp_file, temp_dir)
+                # Read the archive from memory; a separate buffer leaves the upload's position alone
+                extracted_files = self._extract_zip(io.BytesIO(file.getbuffer()))
             elif file.name.lower().endswith('.7z'):
+                # py7zr extracts to disk, so only 7z archives need a temp dir
+                temp_dir = Path(tempfile.mkdtemp())
+                self.temp_dirs.append(temp_dir)
+                temp_file = temp_dir / file.name
+                with open(temp_file, 'wb') as f:
+                    f.write(file.getbuffer())
                 extracted_files = self._extract_7z(temp_file, temp_dir)
             else:
                 return []
             
-            # Parse each extracted file
-            for filename, content in extracted_files:
-                df = self._parse_file_content(filename, content)
-                if df is not None:
-                    dataframes.append(df)
+            # Parsers release the GIL in their C readers, so threads overlap well here. Members
+            # are pulled from the archive as workers free up, so at most `workers` are open at once
+            workers = os.cpu_count() or 1
+            parsed = []
+            try:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='parse') as executor:
+                    in_flight = deque()
+                    for filename, source in extracted_files:
+                        in_flight.append(executor.submit(self._parse_member, filename, source))
+                        if len(in_flight) >= workers:
+                            parsed.append(in_flight.popleft().result())
+                    parsed.extend(future.result() for future in in_flight)
+            finally:
+                # Closes the archive even if extraction stopped partway
+                extracted_files.close()
             
+            dataframes.extend(df for df in parsed if df is not None)
             return dataframes
             
         except Exception as e:
             self.logger.error(f"Error processing compressed file: {e}")
             return []
 
-    def _extract_zip(self, zip_path: Path, temp_dir: Path) -> List[Tuple[str, bytes]]:
-        extracted = []
-        
-        with zipfile.ZipFile(zip_path, 'r') as zip_file:
+    def _extract_zip(self, archive: BinaryIO) -> Iterator[Tuple[str, BinaryIO]]:
+        with zipfile.ZipFile(archive, 'r') as zip_file:
             supported_extensions = ['.csv', '.html', '.htm', '.xls', '.xlsx']
             
             for file_name in zip_file.namelist():
                 if any(file_name.lower().endswith(ext) for ext in supported_extensions):
                     try:
-                        content = zip_file.read(file_name)
-                        clean_name = Path(file_name).name
-                        extracted.append((clean_name, content))
+                        source = zip_file.open(file_name)
                     except Exception as e:
                         self.logger.error(f"Error extracting {file_name}: {e}")
-        
-        return extracted
+                        continue
+                    # Members are decompressed as they are read rather than up front
+                    yield Path(file_name).name, source
 
-    def _extract_7z(self, seven_zip_path: Path, temp_dir: Path) -> List[Tuple[str, bytes]]:
-        extracted = []
-        
+    def _extract_7z(self, seven_zip_path: Path, temp_dir: Path) -> Iterator[Tuple[str, BinaryIO]]:
         try:
             import py7zr
             
@@ -136,41 +157,45 @@ class FileService:
                     if extracted_file.is_file():
                         if any(extracted_file.name.lower().endswith(ext) for ext in supported_extensions):
                             try:
-                                with open(extracted_file, 'rb') as f:
-                                    content = f.read()
-                                extracted.append((extracted_file.name, content))
+                                source = open(extracted_file, 'rb')
                             except Exception as e:
                                 self.logger.error(f"Error reading {extracted_file}: {e}")
+                                continue
+                            yield extracted_file.name, source
                                 
         except ImportError:
             self.logger.error("py7zr not installed. Cannot extract 7z files.")
         except Exception as e:
             self.logger.error(f"Error extracting 7z file: {e}")
-        
-        return extracted
+
+    def _parse_member(self, filename: str, source: BinaryIO) -> Optional[pd.DataFrame]:
+        with source:
+            return self._parse_file_content(filename, source)
 
     def _parse_single_file(self, file) -> Optional[pd.DataFrame]:
         try:
-            file_content = file.read()
+            df = self._parse_file_content(file.name, file)
             file.seek(0)
-            return self._parse_file_content(file.name, file_content)
+            return df
         except Exception as e:
             self.logger.error(f"Error parsing {file.name}: {e}")
             return None
 
-    def _parse_file_content(self, filename: str, content: bytes) -> Optional[pd.DataFrame]:
+    def _parse_file_content(self, filename: str, source: BinaryIO) -> Optional[pd.DataFrame]:
         try:
             file_ext = Path(filename).suffix.lower()
             
             # Check if content is HTML
-            sample = content[:1024].decode('utf-8', errors='ignore')
+            sample = source.read(1024).decode('utf-8', errors='ignore')
+            source.seek(0)
             
             if '<html' in sample.lower() or '<table' in sample.lower():
-                return self._parse_html_content(content)
+                return self._parse_html_content(source.read())
             elif file_ext == '.csv':
-                return self._parse_csv_content(content)
+                return self._parse_csv_content(source)
             elif file_ext in ['.xls', '.xlsx']:
-                return self._parse_excel_content(content, file_ext)
+                # Excel readers seek all over the file, so give them an in-memory buffer
+                return self._parse_excel_content(source.read(), file_ext)
             else:
                 return None
                 
@@ -178,12 +203,22 @@ class FileService:
             self.logger.error(f"Error parsing file content: {e}")
             return None
 
+    def _read_largest_html_table(self, content: bytes) -> Optional[pd.DataFrame]:
+        if lxml is None:
+            tables = pd.read_html(io.BytesIO(content))
+            return max(tables, key=len) if tables else None
+        
+        # Pick the biggest <table> by row count and hand only that element to pandas
+        tables = lxml.html.fromstring(content).xpath('//table')
+        if not tables:
+            return None
+        largest = max(tables, key=lambda table: len(table.xpath(_TABLE_ROWS_XPATH)))
+        return pd.read_html(io.StringIO(lxml.html.tostring(largest, encoding='unicode')))[0]
+
     def _parse_html_content(self, content: bytes) -> Optional[pd.DataFrame]:
         try:
-            tables = pd.read_html(io.BytesIO(content))
-            if tables:
-                df = max(tables, key=len)
-                
+            df = self._read_largest_html_table(content)
+            if df is not None:
                 # Clean up multi-level headers
                 if isinstance(df.columns, pd.MultiIndex):
                     df.columns = [' >> '.join(str(level).strip() for level in col if str(level) != 'nan').strip(' >> ') 
@@ -202,13 +237,27 @@ class FileService:
             self.logger.error(f"HTML parsing failed: {e}")
             return None
 
-    def _parse_csv_content(self, content: bytes) -> Optional[pd.DataFrame]:
+    def _prefix_decodes(self, prefix: bytes, encoding: str) -> bool:
+        # Not final: the prefix may end partway through a multi-byte character
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(prefix)
+            return True
+        except UnicodeDecodeError:
+            return False
+
+    def _parse_csv_content(self, source: BinaryIO) -> Optional[pd.DataFrame]:
         try:
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            # Rule encodings out on a bounded prefix so the common case parses once; seeking
+            # back only re-reads the prefix, even on a compressed archive member
+            prefix = source.read(_SNIFF_CHUNK_SIZE)
+            for encoding in _CSV_ENCODINGS:
+                if not self._prefix_decodes(prefix, encoding):
+                    continue
+                source.seek(0)
                 try:
-                    df = pd.read_csv(io.BytesIO(content), encoding=encoding, index_col=0)
-                    return df
+                    return pd.read_csv(source, encoding=encoding, index_col=0)
                 except UnicodeDecodeError:
+                    # A bad byte past the prefix; try the next encoding
                     continue
             return None
         except Exception as e:
@@ -229,9 +278,9 @@ class FileService:
             
             # Try HTML parsing as fallback for .xls files
             try:
-                tables = pd.read_html(io.BytesIO(content))
-                if tables:
-                    return self._clean_html_table(max(tables, key=len))
+                df = self._read_largest_html_table(content)
+                if df is not None:
+                    return self._clean_html_table(df)
             except:
                 pass
             
@@ -1,12 +1,106 @@
 import logging
+import re
+from itertools import compress
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
-from sklearn.linear_model import LinearRegression, Ridge
-from sklearn.preprocessing import StandardScaler, PolynomialFeatures
-from sklearn.pipeline import make_pipeline
 from scipy import stats
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_YEAR_RE = re.compile(r'\d{4}')
+
+_PRIORITY_METRICS = ('Revenue', 'Net Income', 'Total Assets', 'Operating Cash Flow')
+
+# Model types whose metrics can be fitted together as one polynomial least-squares problem
+_BATCH_DEGREES = {'linear': 1, 'polynomial': 2}
+
+
+def _error_stats_numpy(y: np.ndarray, y_pred: np.ndarray) -> Tuple[float, float, float]:
+    resid = y - y_pred
+    mse = float(np.dot(resid, resid)) / resid.size
+    mae = float(np.abs(resid).mean())
+    if (y == 0).any():
+        return mse, mae, np.nan
+    np.divide(resid, y, out=resid)
+    return mse, mae, float(np.abs(resid).mean()) * 100
+
+
+if njit is not None:
+    # One pass over both arrays for all three errors; compiled eagerly and cached on disk
+    @njit('UniTuple(float64, 3)(float64[:], float64[:])', cache=True)
+    def _error_stats(y, y_pred):
+        n = y.shape[0]
+        sq = 0.0
+        ab = 0.0
+        pct = 0.0
+        has_zero = False
+        for i in range(n):
+            r = y[i] - y_pred[i]
+            sq += r * r
+            ab += abs(r)
+            if y[i] == 0.0:
+                has_zero = True
+            else:
+                pct += abs(r / y[i])
+        return sq / n, ab / n, np.nan if has_zero else pct / n * 100
+else:
+    _error_stats = _error_stats_numpy
+
+
+class _PolynomialTrend:
+    # Least-squares polynomial in the period number; the series are far too short to need sklearn
+    __slots__ = ('coefficients',)
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, degree: int):
+        # polyfit returns NaN coefficients for non-finite input instead of raising, so check
+        # both ends and let the caller skip the metric
+        if not np.isfinite(y).all():
+            raise ValueError("Polynomial trend needs finite values")
+        self.coefficients = np.polyfit(x, y, degree)
+        if not np.isfinite(self.coefficients).all():
+            raise ValueError("Polynomial trend fit did not converge to finite coefficients")
+
+    @classmethod
+    def fit_columns(cls, x: np.ndarray, Y: np.ndarray, degree: int) -> List['_PolynomialTrend']:
+        # polyfit solves every column of Y against the shared design in a single lstsq, so one
+        # non-finite value would turn every column's coefficients into NaN
+        if not np.isfinite(Y).all():
+            raise ValueError("Polynomial trend needs finite values")
+        coefficients = np.polyfit(x, Y, degree)
+        if not np.isfinite(coefficients).all():
+            raise ValueError("Polynomial trend fit did not converge to finite coefficients")
+        trends = []
+        for k in range(coefficients.shape[1]):
+            trend = cls.__new__(cls)
+            trend.coefficients = coefficients[:, k]
+            trends.append(trend)
+        return trends
+
+    def predict(self, X) -> np.ndarray:
+        return np.polyval(self.coefficients, np.asarray(X, dtype=np.float64).ravel())
+
+
+class _ExponentialTrend:
+    # Straight line fitted to log(y + 1), exponentiated back on predict
+    __slots__ = ('intercept', 'slope')
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        # log(y + 1) is undefined at or below -1 (any loss year); polyfit would silently
+        # return NaN coefficients, so refuse the fit and let the caller skip the metric
+        if np.any(y <= -1):
+            raise ValueError("Exponential trend needs every value above -1")
+        self.slope, self.intercept = np.polyfit(x, np.log(y + 1), 1)
+        if not (np.isfinite(self.slope) and np.isfinite(self.intercept)):
+            raise ValueError("Exponential trend fit did not converge to finite coefficients")
+
+    def predict(self, X) -> np.ndarray:
+        log_pred = self.intercept + self.slope * np.asarray(X, dtype=np.float64).ravel()
+        return np.expm1(log_pred, out=log_pred)
+
 
 class MLService:
     def __init__(self, config_manager, state_manager, event_system):
@@ -21,6 +115,7 @@ class MLService:
             'exponential': self._train_exponential,
             'auto': self._train_auto
         }
+        self._key_metrics_cache = None
 
     def forecast_metrics(self, df: pd.DataFrame, periods: int = 3, 
                         model_type: str = 'auto', metrics: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -42,12 +137,14 @@ class MLService:
             forecasts = {}
             accuracy_metrics = {}
             
+            batch_models = self._fit_batch(df, metrics, _BATCH_DEGREES[model_type]) if model_type in _BATCH_DEGREES else {}
+            
             for metric in metrics:
                 if metric in df.index:
                     series = df.loc[metric].dropna()
                     if len(series) >= 3:
                         try:
-                            model = self.models[model_type](series)
+                            model = batch_models.get(metric) or self.models[model_type](series)
                             forecast = self._generate_forecast(model, series, periods)
                             accuracy = self._calculate_accuracy(model, series)
                             
@@ -73,91 +170,89 @@ class MLService:
             self.events.publish("ml_forecast_failed", {"error": str(e)}, "MLService")
             return {'error': str(e)}
 
+    def _fit_batch(self, df: pd.DataFrame, metrics: List[str], degree: int) -> Dict[str, _PolynomialTrend]:
+        # Fully observed metrics share one design matrix; rows with gaps are fitted one by one
+        rows = [metric for metric in dict.fromkeys(metrics) if metric in df.index]
+        if not rows or len(df.columns) < 3 or not df.index.is_unique:
+            return {}
+        try:
+            Y = df.loc[rows].to_numpy(dtype=np.float64)
+        except (TypeError, ValueError):
+            return {}
+        
+        # Gaps and non-finite values both go to the per-metric path, so one bad row cannot
+        # poison the shared lstsq for every other metric
+        complete = np.isfinite(Y).all(axis=1)
+        if not complete.any():
+            return {}
+        x = np.arange(Y.shape[1], dtype=np.float64)
+        try:
+            trends = _PolynomialTrend.fit_columns(x, Y[complete].T, degree)
+        except ValueError:
+            # Leave every metric to the per-metric path, which skips only the bad ones
+            return {}
+        return dict(zip(compress(rows, complete), trends))
+
     def _select_best_model(self, df: pd.DataFrame) -> str:
         # Simple heuristic for model selection
         # In practice, would use cross-validation
         return 'linear'
 
     def _select_key_metrics(self, df: pd.DataFrame) -> List[str]:
-        priority_metrics = ['Revenue', 'Net Income', 'Total Assets', 'Operating Cash Flow']
-        available_metrics = []
-        
-        for metric in priority_metrics:
-            matching = [idx for idx in df.index if metric.lower() in str(idx).lower()]
-            if matching:
-                available_metrics.append(matching[0])
+        # Indexes are immutable, so the selection is reused for as long as the same Index comes back
+        cached = self._key_metrics_cache
+        if cached is None or cached[0] is not df.index:
+            lowered = df.index.astype(str).str.lower()
+            available_metrics = []
+            for metric in _PRIORITY_METRICS:
+                hits = np.flatnonzero(lowered.str.contains(metric.lower(), regex=False))
+                if hits.size:
+                    available_metrics.append(df.index[hits[0]])
+            cached = self._key_metrics_cache = (df.index, available_metrics[:4])
         
-        return available_metrics[:4]
+        return list(cached[1])
+
+    @staticmethod
+    def _prep_xy(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        # float64 up front: object rows left by cleaning would otherwise be converted inside every fit
+        return np.arange(len(series), dtype=np.float64), series.to_numpy(dtype=np.float64, copy=False)
 
     def _train_linear(self, series: pd.Series):
-        X = np.arange(len(series)).reshape(-1, 1)
-        y = series.values
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        return model
+        return _PolynomialTrend(*self._prep_xy(series), 1)
 
     def _train_polynomial(self, series: pd.Series, degree: int = 2):
-        X = np.arange(len(series)).reshape(-1, 1)
-        y = series.values
-        
-        model = make_pipeline(PolynomialFeatures(degree), LinearRegression())
-        model.fit(X, y)
-        
-        return model
+        return _PolynomialTrend(*self._prep_xy(series), degree)
 
     def _train_exponential(self, series: pd.Series):
-        X = np.arange(len(series)).reshape(-1, 1)
-        y = np.log(series.values + 1)
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        # Return wrapper that exponentiates predictions
-        class ExpModel:
-            def __init__(self, base_model):
-                self.base_model = base_model
-            
-            def predict(self, X):
-                log_pred = self.base_model.predict(X)
-                return np.exp(log_pred) - 1
-        
-        return ExpModel(model)
+        return _ExponentialTrend(*self._prep_xy(series))
 
     def _train_auto(self, series: pd.Series):
-        models = {
-            'linear': self._train_linear(series),
-            'polynomial': self._train_polynomial(series),
-        }
+        # Build the design once and share it across the candidates
+        x, y = self._prep_xy(series)
         
-        # Simple model selection based on MSE
+        # Select on a held-out tail the candidates never saw while fitting
         test_size = max(1, len(series) // 5)
         train_size = len(series) - test_size
         
-        best_model = None
-        best_score = float('inf')
-        
-        for name, model in models.items():
-            X_test = np.arange(train_size, len(series)).reshape(-1, 1)
-            y_test = series.values[train_size:]
-            y_pred = model.predict(X_test)
-            
-            mse = np.mean((y_test - y_pred) ** 2)
-            if mse < best_score:
-                best_score = mse
-                best_model = model
+        # A degree needs more training points than it has, or the fit is underdetermined
+        degrees = [degree for degree in (1, 2) if degree < train_size] or [1]
+        predictions = np.vstack([
+            _PolynomialTrend(x[:train_size], y[:train_size], degree).predict(x[train_size:])
+            for degree in degrees
+        ])
+        mse = np.mean((predictions - y[train_size:]) ** 2, axis=1)
         
-        return best_model
+        # Refit the winner on the whole series for forecasting
+        return _PolynomialTrend(x, y, degrees[int(np.argmin(mse))])
 
     def _generate_forecast(self, model, series: pd.Series, periods: int) -> Dict[str, Any]:
         last_index = len(series)
-        future_indices = np.arange(last_index, last_index + periods).reshape(-1, 1)
+        future_indices = np.arange(last_index, last_index + periods, dtype=np.float64)
         
         predictions = model.predict(future_indices)
         
         # Generate future period labels
-        if all(series.index.astype(str).str.match(r'^\d{4}$')):
+        if self._is_year_index(series.index):
             last_year = int(series.index[-1])
             future_periods = [str(last_year + i + 1) for i in range(periods)]
         else:
@@ -169,39 +264,44 @@ class MLService:
             'last_actual': series.iloc[-1]
         }
 
+    @staticmethod
+    def _is_year_index(index: pd.Index) -> bool:
+        if pd.api.types.is_integer_dtype(index.dtype):
+            return len(index) == 0 or (index.min() >= 1000 and index.max() <= 9999)
+        return all(_YEAR_RE.fullmatch(str(label)) for label in index)
+
     def _calculate_accuracy(self, model, series: pd.Series) -> Dict[str, float]:
-        X = np.arange(len(series)).reshape(-1, 1)
-        y = series.values
-        y_pred = model.predict(X)
+        x, y = self._prep_xy(series)
+        y_pred = np.ascontiguousarray(model.predict(x), dtype=np.float64)
         
-        mse = np.mean((y - y_pred) ** 2)
-        mae = np.mean(np.abs(y - y_pred))
-        mape = np.mean(np.abs((y - y_pred) / y)) * 100 if not (y == 0).any() else None
+        mse, mae, mape = _error_stats(y, y_pred)
         
         return {
             'mse': mse,
             'mae': mae,
-            'mape': mape,
+            'mape': None if np.isnan(mape) else mape,
             'rmse': np.sqrt(mse)
         }
 
     def _calculate_confidence_intervals(self, forecasts: Dict[str, Any], 
                                       confidence: float = 0.95) -> Dict[str, Any]:
-        intervals = {}
+        if not forecasts:
+            return {}
         
-        for metric, forecast in forecasts.items():
-            values = np.array(forecast['values'])
-            std = values.std() if len(values) > 1 else values[0] * 0.1
-            
-            z_score = stats.norm.ppf((1 + confidence) / 2)
-            margin = z_score * std
-            
-            intervals[metric] = {
-                'lower': (values - margin).tolist(),
-                'upper': (values + margin).tolist()
-            }
+        # Every forecast covers the same periods, so the metrics stack into one matrix
+        metrics = list(forecasts)
+        values = np.array([forecasts[metric]['values'] for metric in metrics], dtype=np.float64)
+        std = values.std(axis=1) if values.shape[1] > 1 else values[:, 0] * 0.1
+        
+        z_score = stats.norm.ppf((1 + confidence) / 2)
+        margin = (z_score * std)[:, None]
+        lower = (values - margin).tolist()
+        upper = (values + margin).tolist()
         
-        return intervals
+        return {
+            metric: {'lower': lower[i], 'upper': upper[i]}
+            for i, metric in enumerate(metrics)
+        }
 
     def detect_anomalies(self, df: pd.DataFrame, threshold: float = 3.0) -> Dict[str, List[Dict]]:
         anomalies = {
@@ -212,44 +312,50 @@ class MLService:
         
         numeric_df = df.select_dtypes(include=[np.number])
         
-        # Value anomalies using IQR
-        for col in numeric_df.columns:
-            series = numeric_df[col].dropna()
-            if len(series) > 4:
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                
-                if IQR > 0:
-                    lower_bound = Q1 - threshold * IQR
-                    upper_bound = Q3 + threshold * IQR
-                    
-                    anomaly_mask = (series < lower_bound) | (series > upper_bound)
-                    
-                    for idx in series[anomaly_mask].index:
-                        anomalies['value_anomalies'].append({
-                            'metric': str(idx),
-                            'year': str(col),
-                            'value': float(series[idx]),
-                            'lower_bound': lower_bound,
-                            'upper_bound': upper_bound,
-                            'severity': 'high' if abs(series[idx] - series.median()) > 5 * IQR else 'medium'
-                        })
-        
-        # Trend anomalies
-        for idx in numeric_df.index:
-            series = numeric_df.loc[idx].dropna()
-            if len(series) > 2:
-                pct_changes = series.pct_change().dropna()
-                
-                extreme_changes = pct_changes[(pct_changes > 2.0) | (pct_changes < -0.66)]
-                
-                for year, change in extreme_changes.items():
-                    anomalies['trend_anomalies'].append({
-                        'metric': str(idx),
-                        'year': str(year),
-                        'change_pct': float(change * 100),
-                        'severity': 'high' if abs(change) > 3 else 'medium'
-                    })
+        # Value anomalies using IQR, over every column with enough observations at once
+        values = numeric_df.to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        eligible = np.flatnonzero(present.sum(axis=0) > 4)
+        if eligible.size:
+            sub = values[:, eligible]
+            Q1, Q3 = np.nanpercentile(sub, [25, 75], axis=0)
+            IQR = Q3 - Q1
+            median = np.nanmedian(sub, axis=0)
+            lower_bound = Q1 - threshold * IQR
+            upper_bound = Q3 + threshold * IQR
+            
+            # NaN compares False, so missing cells never flag
+            anomaly_mask = ((sub < lower_bound) | (sub > upper_bound)) & (IQR > 0)
+            # Transposed so hits come out column by column, as before
+            for j, i in zip(*np.nonzero(anomaly_mask.T)):
+                value = sub[i, j]
+                anomalies['value_anomalies'].append({
+                    'metric': str(numeric_df.index[i]),
+                    'year': str(numeric_df.columns[eligible[j]]),
+                    'value': float(value),
+                    'lower_bound': float(lower_bound[j]),
+                    'upper_bound': float(upper_bound[j]),
+                    'severity': 'high' if abs(value - median[j]) > 5 * IQR[j] else 'medium'
+                })
+        
+        # Trend anomalies: each observation against the previous observed year in its row,
+        # which is what pct_change gave on the row with its gaps dropped
+        rows, cols = values.shape
+        last_seen = np.maximum.accumulate(np.where(present, np.arange(cols), -1), axis=1)
+        previous = np.full_like(last_seen, -1)
+        previous[:, 1:] = last_seen[:, :-1]
+        comparable = present & (previous >= 0) & (present.sum(axis=1) > 2)[:, None]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = values / np.take_along_axis(values, np.maximum(previous, 0), axis=1) - 1
+        extreme_mask = comparable & ((change > 2.0) | (change < -0.66))
+        
+        for i, j in zip(*np.nonzero(extreme_mask)):
+            anomalies['trend_anomalies'].append({
+                'metric': str(numeric_df.index[i]),
+                'year': str(numeric_df.columns[j]),
+                'change_pct': float(change[i, j] * 100),
+                'severity': 'high' if abs(change[i, j]) > 3 else 'medium'
+            })
         
         return anomalies
@@ -1,7 +1,34 @@
+import copy
 import logging
+import re
+import threading
+import weakref
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _row_volatilities(values: np.ndarray) -> np.ndarray:
+    # Sample std of each row's period-over-period changes, skipping gaps the way
+    # row.dropna().pct_change().dropna().std() does; rows with fewer than two changes give NaN
+    present = ~np.isnan(values)
+    last_seen = np.maximum.accumulate(np.where(present, np.arange(values.shape[1]), -1), axis=1)
+    previous = np.full_like(last_seen, -1)
+    previous[:, 1:] = last_seen[:, :-1]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = values / np.take_along_axis(values, np.maximum(previous, 0), axis=1) - 1
+        valid = present & (previous >= 0) & ~np.isnan(change)
+        count = valid.sum(axis=1)
+        mean = np.where(valid, change, 0.0).sum(axis=1) / count
+        sq_dev = np.where(valid, (change - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        return np.where(count > 1, np.sqrt(sq_dev / (count - 1)), np.nan)
 
 
 class NLQueryService:
@@ -20,15 +47,63 @@ class NLQueryService:
             'anomaly': ['anomaly', 'unusual', 'outlier', 'strange', 'abnormal'],
             'risk': ['risk', 'volatility', 'stability', 'variance']
         }
+        self._intent_automaton = None
+        self._intent_patterns = None
+        self._build_intent_matcher()
+        self._entity_terms_cache = None
+        
+        # (query, id(data), id(analysis)) -> (weakref to data, data version, intent, entities, result),
+        # in LRU order. Frames are only weakly held; the version moves whenever analysis_data is set
+        self._query_cache = OrderedDict()
+        self._max_query_cache_size = 128
+        self._query_cache_lock = threading.Lock()
+        self._data_version = 0
+        if self.state is not None:
+            self.state.register_observer('analysis_data', self._on_data_changed)
+
+    def _build_intent_matcher(self):
+        if ahocorasick is None:
+            self._intent_patterns = [
+                (intent, re.compile('|'.join(map(re.escape, keywords))))
+                for intent, keywords in self.intents.items()
+            ]
+            return
+        
+        # One automaton finds every keyword of every intent in a single pass over the query
+        automaton = ahocorasick.Automaton()
+        for priority, (intent, keywords) in enumerate(self.intents.items()):
+            for keyword in keywords:
+                if keyword not in automaton:
+                    automaton.add_word(keyword, (priority, intent))
+        automaton.make_automaton()
+        self._intent_automaton = automaton
+
+    def _on_data_changed(self, key: str, old_value: Any, new_value: Any):
+        with self._query_cache_lock:
+            self._data_version += 1
+            self._query_cache.clear()
 
     def process_query(self, query: str, data: pd.DataFrame, 
                      analysis: Dict[str, Any]) -> Dict[str, Any]:
         try:
             query_lower = query.lower()
+            cache_key = (query_lower, id(data), id(analysis))
             
-            # Classify intent
-            intent = self._classify_intent(query_lower)
-            entities = self._extract_entities(query_lower, data)
+            # The weakref proves the id still belongs to the same live frame. In-place edits to
+            # the frame are not detected; they take effect once analysis_data is set again
+            with self._query_cache_lock:
+                version = self._data_version
+                cached = self._query_cache.get(cache_key)
+                hit = cached is not None and cached[0]() is data and cached[1] == version
+                if hit:
+                    self._query_cache.move_to_end(cache_key)
+            
+            if hit:
+                _, _, intent, entities, result = cached
+            else:
+                # Classify intent
+                intent = self._classify_intent(query_lower)
+                entities = self._extract_entities(query_lower, data)
             
             self.logger.info(f"Query: {query}, Intent: {intent}, Entities: {entities}")
             
@@ -38,6 +113,10 @@ class NLQueryService:
                 'entities': entities
             }, "NLQueryService")
             
+            if hit:
+                # Each caller gets its own copy to mutate
+                return copy.deepcopy(result)
+            
             # Process based on intent
             handlers = {
                 'growth_rate': self._handle_growth_query,
@@ -50,17 +129,42 @@ class NLQueryService:
             }
             
             handler = handlers.get(intent, self._handle_general_query)
-            return handler(entities, data, analysis)
+            result = handler(entities, data, analysis)
+            
+            # Errors (e.g. ML service not registered yet) are left uncached so a retry can succeed
+            if result.get('type') != 'error':
+                with self._query_cache_lock:
+                    self._query_cache[cache_key] = (weakref.ref(data), version, intent, entities, copy.deepcopy(result))
+                    self._query_cache.move_to_end(cache_key)
+                    if len(self._query_cache) > self._max_query_cache_size:
+                        self._query_cache.popitem(last=False)
+            return result
             
         except Exception as e:
             self.logger.error(f"Query processing failed: {e}")
             return {'type': 'error', 'message': f'Query processing failed: {str(e)}'}
 
     def _classify_intent(self, query: str) -> str:
-        for intent, keywords in self.intents.items():
-            if any(keyword in query for keyword in keywords):
-                return intent
-        return 'general'
+        if self._intent_automaton is None:
+            return next((intent for intent, pattern in self._intent_patterns if pattern.search(query)), 'general')
+        
+        # Intents are listed in priority order, so keep the earliest-listed hit
+        best = None
+        for _, (priority, intent) in self._intent_automaton.iter(query):
+            if best is None or priority < best[0]:
+                best = (priority, intent)
+                if priority == 0:
+                    break
+        return best[1] if best else 'general'
+
+    def _entity_terms(self, data: pd.DataFrame) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, Any]]]:
+        # Labels are stringified once per index; holding the Index objects keeps the identity check sound
+        cached = self._entity_terms_cache
+        if cached is None or cached[0] is not data.index or cached[1] is not data.columns:
+            metric_terms = [(str(metric).lower(), metric) for metric in data.index]
+            year_terms = [(str(col), col) for col in data.columns]
+            cached = self._entity_terms_cache = (data.index, data.columns, metric_terms, year_terms)
+        return cached[2], cached[3]
 
     def _extract_entities(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
         entities = {
@@ -69,15 +173,13 @@ class NLQueryService:
             'periods': []
         }
         
+        metric_terms, year_terms = self._entity_terms(data)
+        
         # Extract metrics
-        for metric in data.index:
-            if str(metric).lower() in query:
-                entities['metrics'].append(metric)
+        entities['metrics'] = [metric for term, metric in metric_terms if term in query]
         
         # Extract years
-        for col in data.columns:
-            if str(col) in query:
-                entities['years'].append(col)
+        entities['years'] = [col for term, col in year_terms if term in query]
         
         # Extract time periods
         if 'last year' in query:
@@ -227,14 +329,10 @@ class NLQueryService:
         # Overall data volatility
         numeric_data = data.select_dtypes(include=[np.number])
         if not numeric_data.empty:
-            volatilities = []
-            for idx in numeric_data.index:
-                series = numeric_data.loc[idx].dropna()
-                if len(series) > 1:
-                    pct_changes = series.pct_change().dropna()
-                    volatilities.append(pct_changes.std())
-            
-            if volatilities:
+            values = numeric_data.to_numpy(dtype=np.float64)
+            eligible = (~np.isnan(values)).sum(axis=1) > 1
+            if eligible.any():
+                volatilities = _row_volatilities(values[eligible])
                 risk_metrics['average_volatility'] = np.mean(volatilities) * 100
         
         return risk_metrics
@@ -4,9 +4,37 @@ import logging
 import numpy as np
 from typing import Dict, Any, List
 from collections import defaultdict, deque
-from datetime import datetime
 from contextlib import contextmanager
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_HISTORY_SIZE = 4096
+
+
+class _OperationStats:
+    # Running aggregates keep summaries O(1); the ring buffers hold only the most recent samples
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'durations_ns', 'memory_deltas')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+        self.durations_ns = np.zeros(_HISTORY_SIZE, dtype=np.int64)
+        self.memory_deltas = np.zeros(_HISTORY_SIZE, dtype=np.int64)
+
+    def record(self, elapsed_ns: int, memory_delta: int):
+        slot = self.count % _HISTORY_SIZE
+        self.durations_ns[slot] = elapsed_ns
+        self.memory_deltas[slot] = memory_delta
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.min_ns = elapsed_ns if self.min_ns is None else min(self.min_ns, elapsed_ns)
+        self.max_ns = elapsed_ns if self.max_ns is None else max(self.max_ns, elapsed_ns)
+
 
 class PerformanceService:
     def __init__(self, config_manager, state_manager, event_system):
@@ -15,7 +43,7 @@ class PerformanceService:
         self.events = event_system
         self.logger = logging.getLogger(__name__)
         
-        self.metrics = defaultdict(list)
+        self.metrics = defaultdict(_OperationStats)
         self.api_metrics = defaultdict(lambda: {
             'requests': 0,
             'successes': 0,
@@ -24,24 +52,29 @@ class PerformanceService:
             'response_times': deque(maxlen=100)
         })
         self._lock = threading.Lock()
+        
+        # One handle for the life of the service instead of a fresh Process() per sample
+        try:
+            self._process = psutil.Process() if psutil is not None else None
+        except Exception:
+            self._process = None
 
     @contextmanager
     def measure(self, operation: str):
-        start_time = time.time()
         start_memory = self._get_memory_usage()
+        start_ns = time.perf_counter_ns()
         
         try:
             yield
         finally:
-            elapsed_time = time.time() - start_time
+            # Monotonic integer clock; seconds are derived only where they are reported
+            elapsed_ns = time.perf_counter_ns() - start_ns
             memory_delta = self._get_memory_usage() - start_memory
             
             with self._lock:
-                self.metrics[operation].append({
-                    'duration': elapsed_time,
-                    'memory_delta': memory_delta,
-                    'timestamp': datetime.now()
-                })
+                self.metrics[operation].record(elapsed_ns, memory_delta)
+            
+            elapsed_time = elapsed_ns / 1e9
             
             if elapsed_time > 1.0:
                 self.logger.warning(f"Slow operation '{operation}': {elapsed_time:.2f}s")
@@ -69,25 +102,25 @@ class PerformanceService:
                 self.logger.error(f"API call to {endpoint} failed: {error}")
 
     def _get_memory_usage(self) -> int:
+        if self._process is None:
+            return 0
         try:
-            import psutil
-            return psutil.Process().memory_info().rss
-        except:
+            return self._process.memory_info().rss
+        except Exception:
             return 0
 
     def get_performance_summary(self) -> Dict[str, Any]:
         with self._lock:
             summary = {}
             
-            for operation, measurements in self.metrics.items():
-                if measurements:
-                    durations = [m['duration'] for m in measurements]
+            for operation, stats in self.metrics.items():
+                if stats.count:
                     summary[operation] = {
-                        'avg_duration': sum(durations) / len(durations),
-                        'max_duration': max(durations),
-                        'min_duration': min(durations),
-                        'total_calls': len(measurements),
-                        'total_time': sum(durations)
+                        'avg_duration': stats.total_ns / stats.count / 1e9,
+                        'max_duration': stats.max_ns / 1e9,
+                        'min_duration': stats.min_ns / 1e9,
+                        'total_calls': stats.count,
+                        'total_time': stats.total_ns / 1e9
                     }
             
             return summary
@@ -1,10 +1,26 @@
 import io
+import math
 import logging
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import xlsxwriter
+from datetime import date, datetime
 from typing import Dict, Any, List
 
 
+def _excel_value(value):
+    # Mirror what DataFrame.to_excel writes: blanks for missing values, 'inf' for infinities
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if math.isnan(value) else ('inf' if value > 0 else '-inf')
+    if isinstance(value, (str, bool, int, float, date)):
+        return value
+    return str(value)
+
+
 class ReportingService:
     def __init__(self, config_manager, state_manager, event_system):
         self.config = config_manager
@@ -18,18 +34,25 @@ class ReportingService:
             
             output = io.BytesIO()
             
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+            # constant_memory spools finished rows to a temp file instead of holding every sheet in RAM
+            workbook = xlsxwriter.Workbook(output, {
+                'constant_memory': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+            })
+            header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            
+            with workbook:
                 # Summary sheet
                 if 'summary' in analysis:
                     summary_df = pd.DataFrame([analysis['summary']])
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                    self._write_sheet(workbook, 'Summary', summary_df, header_format, index=False)
                 
                 # Ratios sheets
                 if 'ratios' in analysis:
                     for category, ratio_df in analysis['ratios'].items():
                         if isinstance(ratio_df, pd.DataFrame):
                             sheet_name = f'Ratios_{category}'[:31]
-                            ratio_df.to_excel(writer, sheet_name=sheet_name)
+                            self._write_sheet(workbook, sheet_name, ratio_df, header_format)
                 
                 # Trends sheet
                 if 'trends' in analysis:
@@ -42,15 +65,14 @@ class ReportingService:
                     
                     if trends_data:
                         trends_df = pd.DataFrame(trends_data)
-                        trends_df.to_excel(writer, sheet_name='Trends', index=False)
+                        self._write_sheet(workbook, 'Trends', trends_df, header_format, index=False)
                 
                 # Insights sheet
                 if 'insights' in analysis:
                     insights_df = pd.DataFrame({'Insights': analysis['insights']})
-                    insights_df.to_excel(writer, sheet_name='Insights', index=False)
+                    self._write_sheet(workbook, 'Insights', insights_df, header_format, index=False)
             
-            output.seek(0)
-            report_data = output.read()
+            report_data = output.getvalue()
             
             self.events.publish("report_generation_completed", {"type": "excel", "size": len(report_data)}, "ReportingService")
             return report_data
@@ -60,6 +82,22 @@ class ReportingService:
             self.events.publish("report_generation_failed", {"type": "excel", "error": str(e)}, "ReportingService")
             raise
 
+    def _write_sheet(self, workbook, sheet_name: str, df: pd.DataFrame, header_format, index: bool = True):
+        # constant_memory flushes a row as soon as the next one starts, so cells must go out strictly
+        # row by row; DataFrame.to_excel writes column by column and would lose all but the last row
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        offset = 1 if index else 0
+        if index:
+            worksheet.write(0, 0, _excel_value(df.index.name), header_format)
+        for c, column in enumerate(df.columns, start=offset):
+            worksheet.write(0, c, _excel_value(column), header_format)
+        
+        for r, (label, values) in enumerate(zip(df.index, df.itertuples(index=False, name=None)), start=1):
+            if index:
+                worksheet.write(r, 0, _excel_value(label), header_format)
+            worksheet.write_row(r, offset, [_excel_value(value) for value in values])
+
     def generate_markdown_report(self, analysis: Dict[str, Any]) -> str:
         try:
             self.events.publish("report_generation_started", {"type": "markdown"}, "ReportingService")
@@ -7,8 +7,45 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional
 from collections import defaultdict, deque
+from functools import lru_cache
 from pathlib import Path
 
+# Compiled once; each alternation answers "does any pattern match" in a single scan
+_SUSPICIOUS_FILENAME_RE = re.compile(
+    r'\.\./|\.\.\\'  # Path traversal
+    r'|[<>:"|?*]'  # Invalid characters
+    r'|^\.'  # Hidden files
+    r'|\.(exe|bat|cmd|sh|ps1)$',  # Executable extensions
+    re.IGNORECASE
+)
+
+_MALICIOUS_HTML_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), message)
+    for pattern, message in (
+        (r'<script', 'JavaScript code detected'),
+        (r'javascript:', 'JavaScript protocol detected'),
+        (r'on\w+\s*=', 'Event handler detected'),
+        (r'<iframe', 'IFrame detected'),
+        (r'<object', 'Object tag detected'),
+        (r'<embed', 'Embed tag detected'),
+        (r'vbscript:', 'VBScript protocol detected'),
+    )
+)
+
+_SQL_INJECTION_RE = re.compile(
+    r"('\s*OR\s*'1'\s*=\s*'1)"
+    r"|(;\s*DROP\s+TABLE)"
+    r"|(;\s*DELETE\s+FROM)"
+    r"|(UNION\s+SELECT)"
+    r"|(INSERT\s+INTO.*VALUES)",
+    re.IGNORECASE
+)
+
+# Characters bleach.clean rewrites; text without any of them comes back unchanged
+_HTML_SPECIAL_RE = re.compile(r'[<>&\x00-\x08\x0b-\x1f\ud800-\udfff]')
+
+_SANITIZE_CACHE_SIZE = 4096
+
 
 class SecurityService:
     def __init__(self, config_manager, state_manager, event_system):
@@ -20,6 +57,7 @@ class SecurityService:
         self._rate_limiter = defaultdict(deque)
         self._blocked_ips = set()
         self._allowed_tags = self.config.security.allowed_html_tags
+        self._clean_cached = lru_cache(maxsize=_SANITIZE_CACHE_SIZE)(self._clean)
 
     def validate_file_upload(self, file) -> Dict[str, Any]:
         result = {
@@ -43,18 +81,10 @@ class SecurityService:
             return result
         
         # Check for suspicious patterns
-        suspicious_patterns = [
-            r'\.\./', r'\.\.\\',  # Path traversal
-            r'[<>:"|?*]',  # Invalid characters
-            r'^\.',  # Hidden files
-            r'\.(exe|bat|cmd|sh|ps1)$',  # Executable extensions
-        ]
-        
-        for pattern in suspicious_patterns:
-            if re.search(pattern, file.name, re.IGNORECASE):
-                result['errors'].append("Suspicious file name pattern detected")
-                result['is_valid'] = False
-                return result
+        if _SUSPICIOUS_FILENAME_RE.search(file.name):
+            result['errors'].append("Suspicious file name pattern detected")
+            result['is_valid'] = False
+            return result
         
         # Additional checks for HTML/XML files
         if file_ext in ['html', 'htm', 'xml']:
@@ -75,18 +105,8 @@ class SecurityService:
             content_str = content.decode('utf-8', errors='ignore')
             
             # Check for malicious patterns
-            malicious_patterns = [
-                (r'<script', 'JavaScript code detected'),
-                (r'javascript:', 'JavaScript protocol detected'),
-                (r'on\w+\s*=', 'Event handler detected'),
-                (r'<iframe', 'IFrame detected'),
-                (r'<object', 'Object tag detected'),
-                (r'<embed', 'Embed tag detected'),
-                (r'vbscript:', 'VBScript protocol detected'),
-            ]
-            
-            for pattern, message in malicious_patterns:
-                if re.search(pattern, content_str, re.IGNORECASE):
+            for pattern, message in _MALICIOUS_HTML_PATTERNS:
+                if pattern.search(content_str):
                     result['errors'].append(f"Security issue: {message}")
                     
         except Exception as e:
@@ -99,10 +119,20 @@ class SecurityService:
         sanitized = df.copy()
         
         # Sanitize string columns
+        enabled = self.config.security.enable_sanitization
         for col in sanitized.select_dtypes(include=['object']).columns:
-            sanitized[col] = sanitized[col].apply(
-                lambda x: self.sanitize_string(str(x)) if pd.notna(x) else x
-            )
+            values = sanitized[col].to_numpy(dtype=object, copy=True)
+            present = pd.notna(values)
+            text = pd.Series([str(x) for x in values[present]], dtype=object)
+            
+            # Only cells containing characters bleach would touch go through it
+            if enabled:
+                special = text.str.contains(_HTML_SPECIAL_RE, na=False).to_numpy()
+                if special.any():
+                    text[special] = text[special].map(self._clean_cached)
+            
+            values[present] = text.to_numpy()
+            sanitized[col] = values
         
         # Check numeric columns for extreme values
         for col in sanitized.select_dtypes(include=[np.number]).columns:
@@ -116,6 +146,9 @@ class SecurityService:
         if not self.config.security.enable_sanitization:
             return text
         
+        return self._clean_cached(text)
+
+    def _clean(self, text: str) -> str:
         return bleach.clean(
             text,
             tags=self._allowed_tags,
@@ -149,17 +182,8 @@ class SecurityService:
         return hashlib.sha256(data.encode()).hexdigest()
 
     def is_sql_injection_attempt(self, text: str) -> bool:
-        sql_patterns = [
-            r"('\s*OR\s*'1'\s*=\s*'1)",
-            r"(;\s*DROP\s+TABLE)",
-            r"(;\s*DELETE\s+FROM)",
-            r"(UNION\s+SELECT)",
-            r"(INSERT\s+INTO.*VALUES)",
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                self.logger.warning(f"Potential SQL injection attempt detected: {text[:50]}...")
-                return True
+        if _SQL_INJECTION_RE.search(text):
+            self.logger.warning(f"Potential SQL injection attempt detected: {text[:50]}...")
+            return True
         
         return False
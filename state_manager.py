@@ -1,28 +1,36 @@
 import threading
 import logging
 from typing import Any, Dict, Optional, Callable
-from contextlib import contextmanager
+from contextlib import contextmanager, ExitStack
+
+# Power of two so a key's stripe is a mask of its hash
+_LOCK_STRIPES = 64
 
 
 class StateManager:
     def __init__(self):
+        # Copy-on-write: writers publish a new dict under _write_lock, so readers never need a lock
         self._state: Dict[str, Any] = {}
-        self._locks: Dict[str, threading.RLock] = {}
+        # A fixed pool of per-key locks; unrelated keys rarely share a stripe and nothing grows with churn.
+        # Writers hold their key's stripe while publishing and notifying, so lock(key) excludes them
+        self._stripes = [threading.RLock() for _ in range(_LOCK_STRIPES)]
         self._global_lock = threading.RLock()
+        # Innermost lock, only held to swap in the new dict; order is global -> stripe -> write
+        self._write_lock = threading.Lock()
         self._validators: Dict[str, Callable] = {}
         self._observers: Dict[str, list] = {}
         self.logger = logging.getLogger(__name__)
 
+    @staticmethod
+    def _stripe_of(key: str) -> int:
+        return hash(key) & (_LOCK_STRIPES - 1)
+
+    def _lock_for(self, key: str) -> threading.RLock:
+        return self._stripes[self._stripe_of(key)]
+
     @contextmanager
     def lock(self, key: Optional[str] = None):
-        if key:
-            if key not in self._locks:
-                with self._global_lock:
-                    if key not in self._locks:
-                        self._locks[key] = threading.RLock()
-            lock = self._locks[key]
-        else:
-            lock = self._global_lock
+        lock = self._lock_for(key) if key else self._global_lock
         
         lock.acquire()
         try:
@@ -31,8 +39,14 @@ class StateManager:
             lock.release()
 
     def get(self, key: str, default: Any = None) -> Any:
-        with self.lock(key):
-            return self._state.get(key, default)
+        return self._state.get(key, default)
+
+    def _notify(self, key: str, old_value: Any, value: Any):
+        for observer in self._observers.get(key, ()):
+            try:
+                observer(key, old_value, value)
+            except Exception as e:
+                self.logger.error(f"Observer error for key {key}: {e}")
 
     def set(self, key: str, value: Any) -> bool:
         try:
@@ -42,46 +56,65 @@ class StateManager:
                     self.logger.warning(f"Validation failed for key: {key}")
                     return False
             
-            with self.lock(key):
-                old_value = self._state.get(key)
-                self._state[key] = value
+            with self._lock_for(key):
+                with self._write_lock:
+                    old_value = self._state.get(key)
+                    state = dict(self._state)
+                    state[key] = value
+                    self._state = state
                 
-                # Notify observers
-                if key in self._observers:
-                    for observer in self._observers[key]:
-                        try:
-                            observer(key, old_value, value)
-                        except Exception as e:
-                            self.logger.error(f"Observer error for key {key}: {e}")
-                
-                return True
+                # Still under the key's lock, so observers see writes to it in order
+                self._notify(key, old_value, value)
+            return True
         except Exception as e:
             self.logger.error(f"Error setting state {key}: {e}")
             return False
 
-    def update(self, updates: Dict[str, Any]):
-        with self._global_lock:
-            for key, value in updates.items():
-                self.set(key, value)
+    def update(self, updates: Dict[str, Any]) -> bool:
+        accepted = {}
+        for key, value in updates.items():
+            if key in self._validators and not self._validators[key](value):
+                self.logger.warning(f"Validation failed for key: {key}")
+                continue
+            accepted[key] = value
+        
+        try:
+            with ExitStack() as stack:
+                # Stripes are taken in index order so concurrent batches cannot deadlock
+                for index in sorted({self._stripe_of(key) for key in accepted}):
+                    stack.enter_context(self._stripes[index])
+                
+                # One publish for the whole batch instead of one per key
+                with self._write_lock:
+                    old_values = {key: self._state.get(key) for key in accepted if key in self._observers}
+                    state = dict(self._state)
+                    state.update(accepted)
+                    self._state = state
+                
+                for key, old_value in old_values.items():
+                    self._notify(key, old_value, accepted[key])
+            
+            return len(accepted) == len(updates)
+        except Exception as e:
+            self.logger.error(f"Error updating state: {e}")
+            return False
 
     def delete(self, key: str):
-        with self.lock(key):
+        with self._lock_for(key), self._write_lock:
             if key in self._state:
-                del self._state[key]
-            if key in self._locks:
-                del self._locks[key]
+                state = dict(self._state)
+                del state[key]
+                self._state = state
 
     def exists(self, key: str) -> bool:
         return key in self._state
 
     def keys(self) -> list:
-        with self._global_lock:
-            return list(self._state.keys())
+        return list(self._state)
 
     def clear(self):
-        with self._global_lock:
-            self._state.clear()
-            self._locks.clear()
+        with self._global_lock, self._write_lock:
+            self._state = {}
 
     def register_validator(self, key: str, validator: Callable[[Any], bool]):
         self._validators[key] = validator
@@ -92,10 +125,11 @@ class StateManager:
         self._observers[key].append(observer)
 
     def get_state_summary(self) -> Dict[str, Any]:
+        state = self._state
         with self._global_lock:
             return {
-                'total_keys': len(self._state),
-                'keys': list(self._state.keys()),
+                'total_keys': len(state),
+                'keys': list(state),
                 'validators': list(self._validators.keys()),
                 'observers': {k: len(v) for k, v in self._observers.items()}
             }
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from ui.base_tab import BaseTab
+from utils.helpers import summarize_dataframe
 
 
 class DataExplorerTab(BaseTab):
@@ -30,21 +31,20 @@ class DataExplorerTab(BaseTab):
     def _render_data_overview(self, data):
         st.subheader("📊 Data Overview")
         
+        summary = summarize_dataframe(data)
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            self.create_metric_card("Total Rows", data.shape[0])
+            self.create_metric_card("Total Rows", summary.rows)
         
         with col2:
-            self.create_metric_card("Total Columns", data.shape[1])
+            self.create_metric_card("Total Columns", summary.cols)
         
         with col3:
-            missing_pct = (data.isnull().sum().sum() / data.size) * 100
-            self.create_metric_card("Missing Data %", f"{missing_pct:.1f}")
+            self.create_metric_card("Missing Data %", f"{summary.missing_pct:.1f}")
         
         with col4:
-            numeric_cols = data.select_dtypes(include=['number']).shape[1]
-            self.create_metric_card("Numeric Columns", numeric_cols)
+            self.create_metric_card("Numeric Columns", summary.numeric_cols)
 
     def _render_data_filters(self, data):
         st.subheader("🔍 Data Filters")
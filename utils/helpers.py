@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from typing import Any, Callable, Optional, Dict
+from typing import Any, Callable, Optional, Dict, NamedTuple
 
 
 def format_indian_number(value: float) -> str:
@@ -146,3 +146,17 @@ def create_metric_summary(df: pd.DataFrame) -> Dict[str, Any]:
                 break
 
     return summary
+
+
+class DataFrameSummary(NamedTuple):
+    rows: int
+    cols: int
+    missing_pct: float
+    numeric_cols: int
+
+
+def summarize_dataframe(df: pd.DataFrame) -> DataFrameSummary:
+    # Not cached: hashing the frame for a cache key costs as much as this single pass
+    missing_pct = float(df.isna().to_numpy().mean() * 100) if df.size else 0.0
+    numeric_cols = df.select_dtypes(include=['number']).shape[1]
+    return DataFrameSummary(df.shape[0], df.shape[1], missing_pct, numeric_cols)